@@ -5,29 +5,34 @@ Upload song PDFs, define the section order, and generate Google Slides
 with proper formatting for church worship.
 """
 
+import importlib.util
 import os
-import re
-import tempfile
 import streamlit as st
 from typing import Dict, List, Tuple
 
-from src.pdf_parser import parse_pdf, get_display_name, get_song_title_from_filename
-from src.song_order import parse_song_order_line, create_default_order
+from src.pdf_parser import parse_pdf_bytes, get_display_name, get_song_title_from_filename
+from src.song_order import parse_song_order_line, parse_order_sections, create_default_order
 from src.text_formatter import format_song_for_slides
+from src.song import Song
 
-# Try to import AI cleaner
-try:
-    from src.ai_cleaner import get_openai_client, clean_all_sections
-    AI_AVAILABLE = True
-except ImportError:
-    AI_AVAILABLE = False
+def _module_available(name: str) -> bool:
+    """Check if a module can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ImportError:
+        # Parent package of a dotted name is missing
+        return False
 
-# Try to import slide generator (may fail if Google API not configured)
-try:
-    from src.slide_generator import generate_slides, get_credentials
-    GOOGLE_API_AVAILABLE = True
-except ImportError:
-    GOOGLE_API_AVAILABLE = False
+
+# Optional features are detected without importing them; openai and the
+# Google client libraries are slow to import, so they load on first use
+AI_AVAILABLE = _module_available('openai')
+
+# Slide generator needs the Google API client libraries
+GOOGLE_API_AVAILABLE = all(
+    _module_available(name)
+    for name in ('googleapiclient', 'google_auth_oauthlib', 'google.oauth2')
+)
 
 
 # Page config
@@ -37,66 +42,139 @@ st.set_page_config(
     layout="wide"
 )
 
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STYLE_PATH = os.path.join(APP_DIR, 'static', 'style.css')
+
+# Parsed PDFs are cached here by content hash so restarts don't re-parse
+PARSE_CACHE_DIR = os.path.join(APP_DIR, '.cache', 'parsed')
+
+
+@st.cache_resource
+def _load_css() -> str:
+    """Read the app stylesheet once per server process."""
+    with open(STYLE_PATH, encoding='utf-8') as f:
+        return f"<style>\n{f.read()}</style>"
+
+
 # Custom CSS for dark theme feel
-st.markdown("""
-<style>
-    .stApp {
-        background-color: #1a1a2e;
-    }
-    .song-card {
-        background-color: #16213e;
-        border-radius: 10px;
-        padding: 20px;
-        margin: 10px 0;
-        border-left: 4px solid #4a86e8;
-    }
-    .section-tag {
-        background-color: #4a86e8;
-        color: white;
-        padding: 5px 10px;
-        border-radius: 5px;
-        margin: 2px;
-        display: inline-block;
-    }
-    .preview-slide {
-        background-color: black;
-        color: white;
-        padding: 40px;
-        margin: 10px 0;
-        border-radius: 8px;
-        text-align: center;
-        position: relative;
-        min-height: 200px;
-    }
-    .preview-title {
-        color: #4a86e8;
-        font-size: 24px;
-        text-decoration: underline;
-        margin-bottom: 20px;
-    }
-    .preview-body {
-        color: white;
-        font-size: 20px;
-        white-space: pre-wrap;
-    }
-    .preview-footer {
-        color: #4a86e8;
-        font-size: 14px;
-        font-style: italic;
-        text-align: right;
-        margin-top: 20px;
-        position: absolute;
-        bottom: 10px;
-        right: 20px;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(_load_css(), unsafe_allow_html=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _parse_pdf_cached(file_bytes: bytes) -> Dict[str, str]:
+    """Parse PDF bytes, cached on content so reruns don't re-parse."""
+    return parse_pdf_bytes(file_bytes, cache_dir=PARSE_CACHE_DIR)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_openai_client_cached(api_key: str):
+    """Keep one OpenAI client (and its connection pool) per API key across reruns."""
+    from src.ai_cleaner import get_openai_client
+    return get_openai_client(api_key)
+
+
+def apply_bulk_order(songs: Dict[str, Song], bulk_text: str) -> Tuple[Dict[str, Song], List[Tuple[str, bool]]]:
+    """
+    Reorder songs to follow a bulk song order text.
+    
+    Returns (ordered_songs, matched) where matched lists (title, has_custom_order)
+    for each song found. Songs not mentioned keep their order at the end.
+    """
+    # Lowercase each title once and index them for exact lookups
+    lower_titles = {filename: song_data.title.lower() for filename, song_data in songs.items()}
+    title_index = {}
+    for filename, title_lower in lower_titles.items():
+        title_index.setdefault(title_lower, filename)
+    
+    ordered_songs = {}
+    unmatched_songs = dict(songs)  # Copy of all songs
+    matched = []
+    
+    for line in bulk_text.splitlines():
+        song_name, order = parse_song_order_line(line)
+        if not song_name:
+            continue
+        
+        name_lower = song_name.lower()
+        filename = title_index.get(name_lower)
+        if filename not in unmatched_songs:
+            # Fall back to substring match in either direction
+            filename = next(
+                (fn for fn in unmatched_songs
+                 if name_lower in lower_titles[fn] or lower_titles[fn] in name_lower),
+                None
+            )
+        if filename is None:
+            continue
+        
+        song_data = unmatched_songs.pop(filename)
+        # If order is provided, use it; otherwise keep PDF order
+        if order:
+            song_data.order = order
+        ordered_songs[filename] = song_data
+        matched.append((song_data.title, bool(order)))
+    
+    # Add any remaining unmatched songs at the end
+    ordered_songs.update(unmatched_songs)
+    return ordered_songs, matched
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _creds_present() -> bool:
+    """Whether credentials.json exists (re-checked at most once a minute)."""
+    return os.path.exists('credentials.json')
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _token_present() -> bool:
+    """Whether token.json exists (re-checked at most once a minute)."""
+    return os.path.exists('token.json')
+
+
+def _apply_order_input(filename: str) -> None:
+    """Update a song's order from its order text box (only runs when it changes)."""
+    order_str = st.session_state[f"order_{filename}"]
+    # Same tokenizing as song_order.md lines: spaces or dashes, "Chorus" -> "C"
+    new_order = parse_order_sections(order_str)
+    st.session_state.songs[filename].order = new_order
+
+
+@st.fragment
+def _slide_preview(slides: List[Tuple[str, ...]]) -> None:
+    """Slide navigator; runs as a fragment so dragging the slider doesn't rerun the whole page."""
+    # Slide navigation
+    slide_idx = st.slider(
+        "Slide",
+        min_value=0,
+        max_value=len(slides) - 1,
+        value=0
+    )
+    
+    slide_data = slides[slide_idx]
+    # Handle both (title, body) and (title, body, footer) formats
+    if len(slide_data) == 3:
+        title, body, footer = slide_data
+    else:
+        title, body = slide_data
+        footer = ""
+    
+    # Preview container
+    footer_html = f'<div class="preview-footer">{footer}</div>' if footer else ''
+    st.markdown(f"""
+    <div class="preview-slide">
+        <div class="preview-title">{title}</div>
+        <div class="preview-body">{body}</div>
+        {footer_html}
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.caption(f"Slide {slide_idx + 1} of {len(slides)}")
 
 
 def init_session_state():
     """Initialize session state variables."""
     if 'songs' not in st.session_state:
-        st.session_state.songs = {}  # {filename: {sections: {}, order: [], title: str}}
+        st.session_state.songs = {}  # {filename: Song}
     if 'slides_preview' not in st.session_state:
         st.session_state.slides_preview = []
     if 'generated_url' not in st.session_state:
@@ -140,29 +218,12 @@ def main():
         if st.button("Apply Bulk Order"):
             if bulk_order:
                 # Parse bulk order and reorder songs
-                ordered_songs = {}
-                unmatched_songs = dict(st.session_state.songs)  # Copy of all songs
-                
-                for line in bulk_order.strip().split('\n'):
-                    song_name, order = parse_song_order_line(line)
-                    if song_name:
-                        # Find matching song in uploaded songs
-                        for filename, song_data in list(unmatched_songs.items()):
-                            if song_name.lower() in song_data['title'].lower() or \
-                               song_data['title'].lower() in song_name.lower():
-                                # If order is provided, use it; otherwise keep PDF order
-                                if order:
-                                    song_data['order'] = order
-                                    st.success(f"✓ {song_data['title']} (custom order)")
-                                else:
-                                    # Keep existing order (PDF order)
-                                    st.success(f"✓ {song_data['title']} (sheet music order)")
-                                ordered_songs[filename] = song_data
-                                del unmatched_songs[filename]
-                                break
-                
-                # Add any remaining unmatched songs at the end
-                ordered_songs.update(unmatched_songs)
+                ordered_songs, matched = apply_bulk_order(st.session_state.songs, bulk_order)
+                for title, has_custom_order in matched:
+                    if has_custom_order:
+                        st.success(f"✓ {title} (custom order)")
+                    else:
+                        st.success(f"✓ {title} (sheet music order)")
                 
                 # Update session state with reordered songs
                 st.session_state.songs = ordered_songs
@@ -201,9 +262,9 @@ def main():
         # Google API status
         st.header("🔑 Google API")
         if GOOGLE_API_AVAILABLE:
-            if os.path.exists('credentials.json'):
+            if _creds_present():
                 st.success("✅ Credentials found")
-                if os.path.exists('token.json'):
+                if _token_present():
                     st.success("✅ Authenticated")
                 else:
                     st.warning("⚠️ Not authenticated yet")
@@ -238,36 +299,33 @@ def main():
         
         if uploaded_files:
             for uploaded_file in uploaded_files:
-                if uploaded_file.name not in st.session_state.songs:
-                    # Save to temp file and parse
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-                        tmp.write(uploaded_file.getvalue())
-                        tmp_path = tmp.name
-                    
-                    try:
-                        sections = parse_pdf(tmp_path)
-                        title = get_song_title_from_filename(uploaded_file.name)
-                        default_order = create_default_order(sections)
-                        
-                        st.session_state.songs[uploaded_file.name] = {
-                            'sections': sections,
-                            'order': default_order,
-                            'title': title,
-                            'temp_path': tmp_path
-                        }
-                        st.success(f"Parsed: {title} ({len(sections)} sections found)")
-                    except Exception as e:
-                        st.error(f"Error parsing {uploaded_file.name}: {e}")
-                    finally:
-                        # Clean up temp file
-                        if os.path.exists(tmp_path):
-                            os.unlink(tmp_path)
+                if uploaded_file.name in st.session_state.songs:
+                    continue
+                
+                # Parsed in-process: the default backends parse a PDF faster
+                # than a worker process starts, and forking Streamlit's
+                # threaded server is unsafe
+                try:
+                    sections = _parse_pdf_cached(uploaded_file.getvalue())
+                except Exception as e:
+                    st.error(f"Error parsing {uploaded_file.name}: {e}")
+                    continue
+                
+                title = get_song_title_from_filename(uploaded_file.name)
+                default_order = create_default_order(sections)
+                
+                st.session_state.songs[uploaded_file.name] = Song(
+                    sections=sections,
+                    order=default_order,
+                    title=title
+                )
+                st.success(f"Parsed: {title} ({len(sections)} sections found)")
         
         # Show all uploaded songs summary
         if st.session_state.songs:
             st.success(f"**📚 {len(st.session_state.songs)} song(s) loaded:**")
             for i, (filename, song_data) in enumerate(st.session_state.songs.items(), 1):
-                st.markdown(f"&nbsp;&nbsp;&nbsp;{i}. {song_data['title']}")
+                st.markdown(f"&nbsp;&nbsp;&nbsp;{i}. {song_data.title}")
         
         # Display uploaded songs
         if st.session_state.songs:
@@ -275,30 +333,27 @@ def main():
             st.subheader("📚 Uploaded Songs")
             
             for filename, song_data in st.session_state.songs.items():
-                with st.expander(f"🎵 {song_data['title']}", expanded=True):
+                with st.expander(f"🎵 {song_data.title}", expanded=True):
                     # Show detected sections
                     st.markdown("**Detected sections:**")
-                    section_tags = " ".join([f"`{k}`" for k in song_data['sections'].keys()])
+                    section_tags = " ".join([f"`{k}`" for k in song_data.sections.keys()])
                     st.markdown(section_tags)
                     
                     # Edit order
                     st.markdown("**Section order:**")
-                    order_str = " ".join(song_data['order'])
-                    new_order_str = st.text_input(
+                    order_str = " ".join(song_data.order)
+                    st.text_input(
                         "Order",
                         value=order_str,
                         key=f"order_{filename}",
-                        label_visibility="collapsed"
+                        label_visibility="collapsed",
+                        on_change=_apply_order_input,
+                        args=(filename,)
                     )
                     
-                    # Update order if changed (supports both spaces and dashes)
-                    new_order = [s.strip() for s in re.split(r'[-\s]+', new_order_str) if s.strip()]
-                    if new_order != song_data['order']:
-                        st.session_state.songs[filename]['order'] = new_order
-                    
                     # Preview sections
                     if st.checkbox("Show section lyrics", key=f"show_{filename}"):
-                        for key, lyrics in song_data['sections'].items():
+                        for key, lyrics in song_data.sections.items():
                             st.markdown(f"**{get_display_name(key)}:**")
                             st.text(lyrics[:500] + "..." if len(lyrics) > 500 else lyrics)
                     
@@ -312,26 +367,28 @@ def main():
                                 api_key = st.session_state.openai_api_key
                                 st.info(f"🔑 API Key: {api_key[:10]}...{api_key[-4:]}")
                                 
-                                client = get_openai_client(api_key)
+                                client = _get_openai_client_cached(api_key)
                                 if client:
                                     st.info("✅ OpenAI client created")
-                                    with st.spinner(f"Formatting {song_data['title']}..."):
+                                    with st.spinner(f"Formatting {song_data.title}..."):
                                         try:
-                                            # Store original for comparison
-                                            original = song_data['sections'].copy()
+                                            # Keep the original for comparison; clean_all_sections
+                                            # returns a new dict, so no copy is needed
+                                            original = song_data.sections
                                             
                                             # Debug: show what we're sending
                                             st.info(f"📤 Sending {len(original)} sections to AI...")
                                             
+                                            from src.ai_cleaner import clean_all_sections
                                             cleaned = clean_all_sections(
-                                                song_data['title'],
-                                                song_data['sections'],
+                                                song_data.title,
+                                                song_data.sections,
                                                 client
                                             )
                                             
                                             st.info(f"📥 Received {len(cleaned)} sections back")
                                             
-                                            st.session_state.songs[filename]['sections'] = cleaned
+                                            st.session_state.songs[filename].sections = cleaned
                                             st.success("✅ Cleaned & Formatted!")
                                             
                                             # Show ALL sections (before/after)
@@ -373,7 +430,7 @@ def main():
                 all_slides = []
                 
                 for idx, (filename, song_data) in enumerate(st.session_state.songs.items()):
-                    song_title = song_data['title']
+                    song_title = song_data.title
                     
                     # Add separator slide between songs (black slide)
                     if idx > 0:
@@ -384,8 +441,8 @@ def main():
                     
                     # Add song slides with footer
                     song_slides = format_song_for_slides(
-                        song_data['sections'],
-                        song_data['order'],
+                        song_data.sections,
+                        song_data.order,
                         get_display_name,
                         max_lines
                     )
@@ -399,38 +456,12 @@ def main():
             if st.session_state.slides_preview:
                 st.markdown(f"**Preview: {len(st.session_state.slides_preview)} slides**")
                 
-                # Slide navigation
-                slide_idx = st.slider(
-                    "Slide",
-                    min_value=0,
-                    max_value=len(st.session_state.slides_preview) - 1,
-                    value=0
-                )
-                
-                slide_data = st.session_state.slides_preview[slide_idx]
-                # Handle both (title, body) and (title, body, footer) formats
-                if len(slide_data) == 3:
-                    title, body, footer = slide_data
-                else:
-                    title, body = slide_data
-                    footer = ""
-                
-                # Preview container
-                footer_html = f'<div class="preview-footer">{footer}</div>' if footer else ''
-                st.markdown(f"""
-                <div class="preview-slide">
-                    <div class="preview-title">{title}</div>
-                    <div class="preview-body">{body}</div>
-                    {footer_html}
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.caption(f"Slide {slide_idx + 1} of {len(st.session_state.slides_preview)}")
+                _slide_preview(st.session_state.slides_preview)
                 
                 st.divider()
                 
                 # Generate to Google Slides
-                if GOOGLE_API_AVAILABLE and os.path.exists('credentials.json'):
+                if GOOGLE_API_AVAILABLE and _creds_present():
                     from datetime import datetime
                     default_title = f"Lyricaster - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
                     presentation_title = st.text_input(
@@ -445,11 +476,14 @@ def main():
                         if st.button("🚀 Generate Google Slides", type="primary"):
                             with st.spinner("Creating presentation..."):
                                 try:
+                                    from src.slide_generator import generate_slides
                                     url = generate_slides(
                                         presentation_title,
                                         st.session_state.slides_preview
                                     )
                                     st.session_state.generated_url = url
+                                    # OAuth may have just created token.json
+                                    _token_present.clear()
                                     st.success("✅ Presentation created!")
                                 except FileNotFoundError as e:
                                     st.error(str(e))
@@ -478,52 +512,40 @@ def main():
                                 # Step 1: Apply bulk order if provided
                                 if 'bulk_order_text' in st.session_state and st.session_state.bulk_order_text:
                                     with st.spinner("📋 Applying song order..."):
-                                        ordered_songs = {}
-                                        unmatched_songs = dict(st.session_state.songs)
-                                        
-                                        for line in st.session_state.bulk_order_text.strip().split('\n'):
-                                            song_name, order = parse_song_order_line(line)
-                                            if song_name:
-                                                for filename, song_data in list(unmatched_songs.items()):
-                                                    if song_name.lower() in song_data['title'].lower() or \
-                                                       song_data['title'].lower() in song_name.lower():
-                                                        # If order provided, use it; otherwise keep PDF order
-                                                        if order:
-                                                            song_data['order'] = order
-                                                        ordered_songs[filename] = song_data
-                                                        del unmatched_songs[filename]
-                                                        break
-                                        
-                                        ordered_songs.update(unmatched_songs)
+                                        ordered_songs, _ = apply_bulk_order(
+                                            st.session_state.songs,
+                                            st.session_state.bulk_order_text
+                                        )
                                         st.session_state.songs = ordered_songs
                                 
                                 # Step 2: AI cleanup
                                 with st.spinner("🤖 Cleaning lyrics with AI..."):
-                                    client = get_openai_client(st.session_state.openai_api_key)
+                                    client = _get_openai_client_cached(st.session_state.openai_api_key)
                                     if client:
                                         # Clean all songs
+                                        from src.ai_cleaner import clean_all_sections
                                         for filename, song_data in st.session_state.songs.items():
                                             try:
                                                 cleaned = clean_all_sections(
-                                                    song_data['title'],
-                                                    song_data['sections'],
+                                                    song_data.title,
+                                                    song_data.sections,
                                                     client
                                                 )
-                                                st.session_state.songs[filename]['sections'] = cleaned
+                                                st.session_state.songs[filename].sections = cleaned
                                             except Exception as e:
-                                                st.warning(f"AI cleanup failed for {song_data['title']}: {e}")
+                                                st.warning(f"AI cleanup failed for {song_data.title}: {e}")
                                 
                                 with st.spinner("📊 Generating slides..."):
                                     # Regenerate preview with cleaned lyrics
                                     all_slides = []
                                     for idx, (filename, song_data) in enumerate(st.session_state.songs.items()):
-                                        song_title = song_data['title']
+                                        song_title = song_data.title
                                         if idx > 0:
                                             all_slides.append(("", "", ""))
                                         all_slides.append((song_title.upper(), "", ""))
                                         song_slides = format_song_for_slides(
-                                            song_data['sections'],
-                                            song_data['order'],
+                                            song_data.sections,
+                                            song_data.order,
                                             get_display_name,
                                             max_lines
                                         )
@@ -533,11 +555,14 @@ def main():
                                 
                                 with st.spinner("🚀 Creating Google Slides..."):
                                     try:
+                                        from src.slide_generator import generate_slides
                                         url = generate_slides(
                                             presentation_title,
                                             st.session_state.slides_preview
                                         )
                                         st.session_state.generated_url = url
+                                        # OAuth may have just created token.json
+                                        _token_present.clear()
                                         st.success("✅ Done! AI cleaned + Slides created!")
                                     except Exception as e:
                                         st.error(f"Error: {e}")
@@ -3,9 +3,41 @@ AI Lyrics Cleaner - Use OpenAI to fix OCR errors and clean up lyrics.
 """
 
 import os
-from typing import Dict, Optional
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional, Tuple
 from openai import OpenAI
 
+from src.local_cleaner import fix_lyrics_locally, fix_sections_locally, needs_ai_cleanup
+
+
+# Per-request timeout so a stalled call can't hang the UI
+REQUEST_TIMEOUT_SECONDS = 30
+
+# Cache of successful AI results so repeated clicks on identical lyrics
+# don't pay for another request. Keys are the request inputs.
+# Shared by clean_all_sections' worker threads and concurrent app sessions,
+# so every access holds _cleaned_cache_lock.
+MAX_CACHE_ENTRIES = 512
+_cleaned_cache: "OrderedDict[Tuple, object]" = OrderedDict()
+_cleaned_cache_lock = threading.Lock()
+
+
+def _cache_get(key: Tuple):
+    """Look up a cached AI result (None if missing)."""
+    with _cleaned_cache_lock:
+        return _cleaned_cache.get(key)
+
+
+def _cache_put(key: Tuple, value) -> None:
+    """Store an AI result, evicting the oldest entry when full."""
+    with _cleaned_cache_lock:
+        if key not in _cleaned_cache and len(_cleaned_cache) >= MAX_CACHE_ENTRIES:
+            _cleaned_cache.popitem(last=False)
+        _cleaned_cache[key] = value
+
 
 def get_openai_client(api_key: Optional[str] = None) -> Optional[OpenAI]:
     """Get OpenAI client with API key from parameter or environment."""
@@ -35,6 +67,17 @@ def clean_lyrics_with_ai(
     Returns:
         Cleaned and formatted lyrics text
     """
+    cache_key = ('section', song_title, section_name, lyrics, format_for_slides)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Fix the deterministic errors locally first
+    lyrics = fix_lyrics_locally(lyrics)
+    if not format_for_slides and not needs_ai_cleanup(lyrics):
+        # Nothing left that needs the model; slide formatting always does
+        return lyrics
+    
     if format_for_slides:
         prompt = f"""You are a worship lyrics proofreader. Fix typos and adjust spacing for projection slides.
 
@@ -92,12 +135,16 @@ Corrected lyrics:"""
             messages=[
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.1,  # Low temperature for consistent corrections
-            max_tokens=1000
+            temperature=0,  # Deterministic corrections
+            # Cleaned lyrics are about as long as the input; don't let short
+            # sections wander up to the full token budget
+            max_tokens=min(1000, max(64, 2 * len(lyrics))),
+            timeout=REQUEST_TIMEOUT_SECONDS
         )
         
         cleaned = response.choices[0].message.content.strip()
         print(f"AI cleaned '{section_name}': {len(lyrics)} chars -> {len(cleaned)} chars")
+        _cache_put(cache_key, cleaned)
         return cleaned
         
     except Exception as e:
@@ -107,6 +154,105 @@ Corrected lyrics:"""
         return lyrics  # Return original on error
 
 
+def clean_song_with_ai(
+    song_title: str,
+    sections: Dict[str, str],
+    client: OpenAI
+) -> Optional[Dict[str, str]]:
+    """
+    Clean and format every section of a song in a single request.
+    
+    The rules are sent once for the whole song and the model answers with
+    a JSON object mapping each section key to its cleaned lyrics.
+    
+    Args:
+        song_title: Name of the song
+        sections: Dict of section_key -> lyrics
+        client: OpenAI client
+    
+    Returns:
+        Dict of section_key -> cleaned lyrics, or None if the response
+        could not be used (caller should fall back to per-section cleaning)
+    """
+    from src.pdf_parser import get_display_name
+    
+    cache_key = ('song', song_title, tuple(sections.items()))
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return dict(cached)
+    
+    sections_text = "\n\n".join(
+        f"## {key} ({get_display_name(key)})\n{lyrics}"
+        for key, lyrics in sections.items()
+    )
+    keys_list = ", ".join(f'"{key}"' for key in sections)
+    total_chars = sum(len(lyrics) for lyrics in sections.values())
+    
+    prompt = f"""You are a worship lyrics proofreader. Fix typos and adjust spacing for projection slides.
+
+Song: "{song_title}"
+
+Extracted lyrics, one section per "## KEY (NAME)" heading:
+{sections_text}
+
+STRICT RULES:
+1. DO NOT add new words or remove existing words
+2. DO NOT change the meaning or rewrite lyrics
+3. ONLY fix these issues:
+   - Typos and spelling errors (e.g., "kingdom s" → "kingdoms")
+   - Merged words (e.g., "Jesuswalked" → "Jesus walked")
+   - Split words (e.g., "for ever" → "forever")
+   - Missing spaces or extra spaces
+
+4. FORMAT for readability (max 4 slides worth per section, consolidate lines):
+   - Keep lines readable but CONSOLIDATED (don't over-split)
+   - Short repeated phrases can stay on ONE line:
+     GOOD: "Yes Lord, yes Lord, yes yes Lord"
+     BAD: splitting into 3+ separate lines
+   - Longer repeated phrases split into 2-3 lines max:
+     "Crown Him King forever, crown Him King forever, crown Him King forevermore"
+     becomes 2-3 lines, not more
+   - Aim for 8-12 words per line when possible
+
+5. Capitalize reverent pronouns: He, Him, His, You, Your (referring to God)
+
+Return ONLY a JSON object with exactly these keys: {keys_list}
+Each value is the cleaned lyrics for that section, with lines separated by "\\n"."""
+
+    try:
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,  # Deterministic corrections
+            max_tokens=min(4000, max(256, 2 * total_chars)),
+            timeout=2 * REQUEST_TIMEOUT_SECONDS
+        )
+        
+        result = json.loads(response.choices[0].message.content)
+        if not isinstance(result, dict):
+            print(f"AI batch cleaning for '{song_title}' returned non-object JSON")
+            return None
+        
+        cleaned_sections = {}
+        for key, lyrics in sections.items():
+            cleaned = result.get(key)
+            if not isinstance(cleaned, str) or not cleaned.strip():
+                print(f"AI batch cleaning for '{song_title}' missing section {key}")
+                return None
+            cleaned_sections[key] = cleaned.strip()
+        
+        print(f"AI cleaned '{song_title}': {len(sections)} sections in one request")
+        _cache_put(cache_key, dict(cleaned_sections))
+        return cleaned_sections
+        
+    except Exception as e:
+        print(f"AI batch cleaning error for '{song_title}': {e}")
+        return None
+
+
 def clean_all_sections(
     song_title: str,
     sections: Dict[str, str],
@@ -116,6 +262,9 @@ def clean_all_sections(
     """
     Clean all sections of a song with AI.
     
+    Tries a single batched request first and falls back to cleaning each
+    section separately if the batched response can't be used.
+    
     Args:
         song_title: Name of the song
         sections: Dict of section_key -> lyrics
@@ -127,21 +276,42 @@ def clean_all_sections(
     """
     from src.pdf_parser import get_display_name
     
-    cleaned_sections = {}
+    if not sections:
+        return {}
+    
     total = len(sections)
+    sections = fix_sections_locally(sections)
     
-    for i, (key, lyrics) in enumerate(sections.items()):
-        section_name = get_display_name(key)
-        
+    batched = clean_song_with_ai(song_title, sections, client)
+    if batched is not None:
         if progress_callback:
-            progress_callback(section_name, i, total)
+            for i, key in enumerate(sections):
+                progress_callback(get_display_name(key), i, total)
+        return batched
+    
+    cleaned_sections = {}
+    
+    # Each section is an independent HTTP request, so fan them out to a thread
+    # pool. The OpenAI client is thread-safe and can be shared by all workers.
+    with ThreadPoolExecutor(max_workers=min(8, total)) as executor:
+        futures = {}
+        for key, lyrics in sections.items():
+            section_name = get_display_name(key)
+            future = executor.submit(
+                clean_lyrics_with_ai,
+                song_title,
+                section_name,
+                lyrics,
+                client
+            )
+            futures[future] = (key, section_name)
         
-        cleaned_sections[key] = clean_lyrics_with_ai(
-            song_title, 
-            section_name, 
-            lyrics, 
-            client
-        )
+        for i, future in enumerate(as_completed(futures)):
+            key, section_name = futures[future]
+            cleaned_sections[key] = future.result()
+            
+            if progress_callback:
+                progress_callback(section_name, i, total)
     
-    return cleaned_sections
-
+    # Preserve the original section order
+    return {key: cleaned_sections[key] for key in sections}
@@ -0,0 +1,53 @@
+"""
+Local Lyrics Cleaner - Rule-based fixes for common PDF extraction errors.
+- Recover "-fied" verbs split by a dropped fi ligature (e.g. "glori ed" -> "glorified")
+- Detect whether lyrics still look damaged enough to need the AI cleaner
+"""
+
+import re
+from typing import Dict
+
+
+# Whole words broken by a dropped ligature (e.g. "rstborn") are already
+# repaired by the PDF parser; see LIGATURE_WORD_FIXES in pdf_parser.
+
+# "-fied" verbs that lose their "fi" and get split, e.g. "glori ed" -> "glorified"
+FIED_RE = re.compile(
+    r'\b(glori|satis|puri|justi|cruci|magni|sancti|testi|signi|terri|mysti|quali)\s?ed\b',
+    re.IGNORECASE
+)
+
+# Signs of damage the local rules can't repair
+CAMEL_JOIN_RE = re.compile(r'[a-z][A-Z]')
+STRAY_LETTER_RE = re.compile(r'(?<![\w\'])(?![aAIO]\b)[A-Za-z](?![\w\'])')
+LONG_WORD_RE = re.compile(r'[A-Za-z]{15,}')
+DOUBLE_SPACE_RE = re.compile(r' {2,}')
+
+
+def fix_lyrics_locally(lyrics: str) -> str:
+    """
+    Apply deterministic fixes for dropped ligatures.
+    Line breaks and all other text are left untouched.
+    """
+    def replace_fied(match):
+        return match.group(1) + 'fied'
+
+    return FIED_RE.sub(replace_fied, lyrics)
+
+
+def needs_ai_cleanup(lyrics: str) -> bool:
+    """
+    Check whether lyrics still show extraction damage after local fixes.
+    Looks for merged words, stray single letters and doubled spaces.
+    """
+    return bool(
+        CAMEL_JOIN_RE.search(lyrics)
+        or STRAY_LETTER_RE.search(lyrics)
+        or LONG_WORD_RE.search(lyrics)
+        or DOUBLE_SPACE_RE.search(lyrics)
+    )
+
+
+def fix_sections_locally(sections: Dict[str, str]) -> Dict[str, str]:
+    """Apply fix_lyrics_locally to every section of a song."""
+    return {key: fix_lyrics_locally(lyrics) for key, lyrics in sections.items()}
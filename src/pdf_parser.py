@@ -3,10 +3,63 @@ PDF Parser - Extract lyrics and sections from song PDFs.
 Handles two-column layouts, filters out chords, instrumentals, and legal footers.
 """
 
+import functools
+import hashlib
+import io
+import json
+import logging
+import os
 import re
-from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import Dict, List, Tuple, Optional, Union, BinaryIO, Iterable, Iterator
 import pdfplumber
 
+# pdfminer logs every object at DEBUG, which slows parsing dramatically
+# when the host app (e.g. Streamlit) runs with verbose logging
+logging.getLogger('pdfminer').setLevel(logging.ERROR)
+logging.getLogger('pdfplumber').setLevel(logging.ERROR)
+
+# Bump whenever parsing rules change so stale on-disk cache entries are ignored
+PARSE_CACHE_VERSION = 1
+
+# PyMuPDF is much faster than pdfplumber at word extraction; use it when installed.
+# It is AGPL-licensed, so it is an optional extra rather than a requirement
+# (imported as pymupdf; the legacy fitz name warns on current releases)
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    try:
+        import fitz as pymupdf
+        PYMUPDF_AVAILABLE = True
+    except ImportError:
+        PYMUPDF_AVAILABLE = False
+
+# pypdfium2 exposes PDFium's text segments directly, also far cheaper than pdfplumber
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+# NumPy (pulled in by Streamlit) vectorizes column splitting on dense pages
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Words whose tops differ by less than this share a line
+LINE_TOP_THRESHOLD = 5
+
+# Sort keys for word dicts (C-level, cheaper than lambdas)
+WORD_POSITION_KEY = itemgetter('top', 'x0')
+WORD_X0_KEY = itemgetter('x0')
+
+# Below this many words the pure-Python split beats NumPy's setup cost
+NUMPY_MIN_WORDS = 64
+
 
 # Sections we want to extract (case insensitive)
 VALID_SECTIONS = {'VERSE', 'CHORUS', 'VAMP', 'BRIDGE', 'PRE-CHORUS', 'TAG'}
@@ -14,6 +67,15 @@ VALID_SECTIONS = {'VERSE', 'CHORUS', 'VAMP', 'BRIDGE', 'PRE-CHORUS', 'TAG'}
 # Sections to IGNORE
 IGNORED_SECTIONS = {'INSTRUMENTAL', 'INTERLUDE', 'INTRO', 'OUTRO', 'ENDING', 'TURNAROUND'}
 
+# Section header patterns: "[Verse 1]" and "CHORUS 1A" style
+BRACKET_HEADER_RE = re.compile(
+    r'^\[(?P<type>Verse|Chorus|Vamp|Bridge|Pre-Chorus|Tag)\s*(?P<num>\d*[A-Z]?)\]',
+    re.IGNORECASE
+)
+SECTION_HEADER_RE = re.compile(
+    r'^(?P<type>' + '|'.join(sorted(VALID_SECTIONS)) + r')\s*(?P<num>\d*[A-Z]?)$'
+)
+
 # Navigation/direction markers to filter out
 NAVIGATION_PATTERNS = [
     r'\(To\s+\w+.*?\)',  # (To Turnaround), (To Instrumental), (To Chorus 1b)
@@ -22,6 +84,139 @@ NAVIGATION_PATTERNS = [
     r'Grace Praise',  # Publisher credit
     r'Praise Charts',  # Publisher credit
 ]
+# One alternation so each line is scanned once instead of once per pattern
+NAVIGATION_RE = re.compile(
+    '|'.join(f'(?:{p})' for p in NAVIGATION_PATTERNS),
+    re.IGNORECASE
+)
+
+CHORD_ROOTS = frozenset('ABCDEFG')
+
+# Chord symbols: A, Am, Am7, G(4), F2, F/C, Gsus4, Bb, C#m, Dm7/F, etc.
+CHORD_RE = re.compile(
+    r'^[A-G][#b]?'  # Root note (A-G with optional sharp/flat)
+    r'(?:m|maj|min|dim|aug|sus|add)?'  # Quality (optional)
+    r'[0-9]*'  # Extension like 7, 9, 11, 13 (optional)
+    r'(?:\([0-9]+\))?'  # Parenthetical extension like (4) (optional)
+    r'(?:/[A-G][#b]?)?$'  # Bass note like /E (optional)
+)
+CHORD_FRAGMENT_RE = re.compile(r'^/[A-G][#b]?$')  # "/E", "/G#"
+CHART_REPEAT_MARKS = frozenset({'x2', 'x3', 'x4'})  # "| C | G | x2"
+
+# Substrings (lowercase) that mark footer/legal lines
+FOOTER_INDICATORS = (
+    'ccli', 'license', 'copyright', '©', 'www.', '.com', '.org',
+    'all rights reserved', 'used by permission', 'terms of use',
+    'songselect', 'integrity', 'hosanna', '# ', 'based on the recording'
+)
+
+# Metadata lines like "Key - C | Tempo - 72 | Time - 3/4"
+KEY_METADATA_RE = re.compile(r'^Key\s*[-–]', re.IGNORECASE)
+TEMPO_METADATA_RE = re.compile(r'^Tempo\s*[-–]', re.IGNORECASE)
+
+BRACKETS_RE = re.compile(r'[\[\]]')
+LAI_LINE_RE = re.compile(r'^[Ll]ai[\s,lai-]+$', re.IGNORECASE)
+
+# Lyric line repairs (applied in order by clean_lyrics_line)
+SPLIT_WORD_RE = re.compile(r'(\w)\s+-\s+(\w)')  # "sor - rows" -> "sorrows"
+DASH_MEN_RE = re.compile(r'^-\s*men$', re.IGNORECASE)  # "- men" -> "Amen"
+A_MEN_RE = re.compile(r'\bA\s*-\s*men\b', re.IGNORECASE)  # "A - men" -> "Amen"
+POSSESSIVE_JOIN_RE = re.compile(r"'s(?=[a-z])")  # "joy'sgonna" -> "joy's gonna"
+SPACED_DASH_RE = re.compile(r'\s+-\s+')
+MULTI_SPACE_RE = re.compile(r'\s{2,}')
+
+# Words that PDF extraction often merges with the next word
+MERGED_WORDS = [
+    'Jesus',  # Jesuswalked -> Jesus walked
+    'wondrous',  # wondrousfaith -> wondrous faith
+    'daily',  # dailyin -> daily in
+    'never',  # neverfully -> never fully
+    'unchanging',  # unchanginglove -> unchanging love
+    'Saviour',  # Saviourprayed -> Saviour prayed
+    'Savior',  # American spelling
+    'glory',  # gloryat -> glory at
+    'lifted',  # liftedhigh -> lifted high
+    'everlasting',  # everlastingYou -> everlasting You
+    'heaven',  # heavenso -> heaven so
+    'kingdom',  # kingdomfirst -> kingdom first
+    'summer',  # summerfilled -> summer filled
+    'thousand',
+    'ransomed',  # ransomedglory -> ransomed glory
+]
+
+# Joined words fixed in a single pass: comma joins ("everlasting,You"),
+# camelCase joins ("JesusWalked") and the known merged words above.
+# Each alternative only inserts a space. The merged-word lookahead keeps
+# IGNORECASE like the old separate passes, except where a lowercase letter
+# meets an uppercase one, inside the word ("jeSus") or after it: those
+# joins are left to the camelCase split, which used to run first.
+JOINED_WORDS_RE = re.compile(
+    r'(?P<comma>,)(?=[A-Za-z])'
+    r'|(?P<camel>[a-z])(?=[A-Z])'
+    + ''.join(
+        rf'|(?!.{{0,{len(word) - 2}}}[a-z][A-Z])'
+        rf'(?P<merged{i}>(?i:{word}))(?!(?<=[a-z])[A-Z])(?=(?i:[a-z]))'
+        for i, word in enumerate(MERGED_WORDS)
+    )
+)
+JOINED_WORDS_REPLACEMENTS = {
+    'comma': ', ',
+    **{f'merged{i}': f'{word} ' for i, word in enumerate(MERGED_WORDS)},
+}
+
+# Missing ligatures (fi, fl, ff, etc.) - common PDF extraction issue
+# These often appear as missing characters, leaving broken whole words.
+# Only broken forms that aren't English words themselves are listed
+# (e.g. "owing", "awless", "ock", "elds" and "nite" are real words).
+LIGATURE_WORD_FIXES = {
+    'rst': 'first',
+    'rstborn': 'firstborn',
+    'rstfruits': 'firstfruits',
+    'ght': 'fight',
+    'ghts': 'fights',
+    'nd': 'find',
+    'nds': 'finds',
+    'nally': 'finally',
+    'nal': 'final',
+    'nished': 'finished',
+    'innite': 'infinite',
+    'ery': 'fiery',
+    'ames': 'flames',
+    'ood': 'flood',
+    'oods': 'floods',
+    'ows': 'flows',
+    'esh': 'flesh',
+    'ourish': 'flourish',
+    'eort': 'effort',  # missing ff
+    'ecting': 'effecting',
+    'ects': 'effects',
+}
+# One pass: broken whole words (in any case) go through the map, any word
+# ending in "lled" becomes "filled", and "ful lled" glued to what follows
+# (left behind by the dash repairs, e.g. "ful lled1") becomes "fulfilled"
+LIGATURE_RE = re.compile(
+    r'\b((?i:' + '|'.join(sorted(LIGATURE_WORD_FIXES, key=len, reverse=True)) + r'))\b'
+    r'|lled\b|(ful lled)\B'
+)
+
+# Cheap probes for the repair passes in clean_lyrics_line: if neither
+# matches, no repair can change the line and all of them are skipped.
+# Merged words are probed in the lowercased line, since IGNORECASE made
+# the probe several times slower.
+NEEDS_REPAIR_RE = re.compile(
+    r"-|'s[a-z]|,[A-Za-z]|[a-z][A-Z]|" + LIGATURE_RE.pattern
+)
+MERGED_WORD_PROBE_RE = re.compile(
+    '(?:' + '|'.join(word.lower() for word in MERGED_WORDS) + ')[a-z]'
+)
+
+# Song title cleanup (see get_song_title_from_filename)
+TITLE_NUMBER_PREFIX_RE = re.compile(r'^\d+\.\s*')
+TITLE_CHORDS_SUFFIX_RE = re.compile(r'-chords-[A-G][#b]?.*$', re.IGNORECASE)
+TITLE_VERSION_RE = re.compile(r'\s*\(\d+\)\s*$')
+TITLE_PARENTHETICAL_RE = re.compile(r'\s*\([^)]+\)\s*$')
+TITLE_KEY_SUFFIX_RE = re.compile(r'\s*-\s*[A-G][#b]?(?:~[A-G][#b]?)?\s*$')
+TITLE_KEY_OF_RE = re.compile(r'\s*-\s*(?:key\s+(?:of\s+)?)?[A-G][#b]?(?:m|maj|min)?\s*$', re.IGNORECASE)
 
 
 def normalize_section_key(section_type: str, section_num: str = '') -> str:
@@ -42,26 +237,31 @@ def normalize_section_key(section_type: str, section_num: str = '') -> str:
     return f"{abbrev}{section_num}"
 
 
+# Section keys like V1, C, C1A, C1B, Va, etc.
+# Note: Va must come before V in alternation to match correctly
+SECTION_KEY_RE = re.compile(r'^(Va|PC|Tag|V|C|B)(\d*[A-Z]?)$', re.IGNORECASE)
+
+# Key abbreviation -> display name
+SECTION_DISPLAY_NAMES = {
+    'V': 'VERSE',
+    'C': 'CHORUS',
+    'B': 'BRIDGE',
+    'Va': 'VAMP',
+    'PC': 'PRE-CHORUS',
+    'Tag': 'TAG',
+}
+
+
+@functools.lru_cache(maxsize=128)
 def get_display_name(section_key: str) -> str:
     """Convert section key to display name for slide titles."""
-    # Match patterns like V1, C, C1A, C1B, Va, etc.
-    # Note: Va must come before V in alternation to match correctly
-    match = re.match(r'^(Va|PC|Tag|V|C|B)(\d*[A-Z]?)$', section_key, re.IGNORECASE)
+    match = SECTION_KEY_RE.match(section_key)
     if not match:
         return section_key.upper()
     
     abbrev, num = match.groups()
     
-    name_map = {
-        'V': 'VERSE',
-        'C': 'CHORUS',
-        'B': 'BRIDGE',
-        'Va': 'VAMP',
-        'PC': 'PRE-CHORUS',
-        'Tag': 'TAG',
-    }
-    
-    full_name = name_map.get(abbrev, abbrev.upper())
+    full_name = SECTION_DISPLAY_NAMES.get(abbrev, abbrev.upper())
     if num:
         return f"{full_name} {num}"
     return full_name
@@ -73,38 +273,24 @@ def is_chord(word: str) -> bool:
     Matches: A, Am, Am7, G(4), F2, F/C, Gsus4, Bb, C#m, Dm7/F, etc.
     """
     word = word.strip()
-    if not word:
+    # Cheap first-character test rejects nearly all lyric words before the regex
+    if not word or word[0] not in CHORD_ROOTS:
         return False
     
-    # Comprehensive chord pattern
-    chord_pattern = re.compile(
-        r'^[A-G][#b]?'  # Root note (A-G with optional sharp/flat)
-        r'(?:m|maj|min|dim|aug|sus|add)?'  # Quality (optional)
-        r'[0-9]*'  # Extension like 7, 9, 11, 13 (optional)
-        r'(?:\([0-9]+\))?'  # Parenthetical extension like (4) (optional)
-        r'(?:/[A-G][#b]?)?$'  # Bass note like /E (optional)
-    )
-    
-    return bool(chord_pattern.match(word))
+    return bool(CHORD_RE.match(word))
 
 
 def is_chord_line(line: str) -> bool:
     """Check if a line consists only of chord symbols and separators."""
-    line = line.strip()
-    if not line:
-        return False
-    
     # Check for chord chart patterns like "| C | Am7 | F2 |"
     if '|' in line:
         # Remove pipes and check what's left
-        parts = re.split(r'[\s|]+', line)
-        parts = [p for p in parts if p and p not in ['x2', 'x3', 'x4']]
+        parts = [p for p in line.replace('|', ' ').split() if p not in CHART_REPEAT_MARKS]
         if parts and all(is_chord(p) for p in parts):
             return True
     
-    # Split by spaces
-    parts = re.split(r'\s+', line)
-    parts = [p for p in parts if p]
+    # Split by spaces (str.split drops empty parts itself)
+    parts = line.split()
     
     if not parts:
         return False
@@ -113,63 +299,88 @@ def is_chord_line(line: str) -> bool:
     return all(is_chord(p) for p in parts)
 
 
-def is_footer_line(line: str) -> bool:
-    """Check if line is part of footer/legal content."""
-    line_lower = line.lower()
-    footer_indicators = [
-        'ccli', 'license', 'copyright', '©', 'www.', '.com', '.org',
-        'all rights reserved', 'used by permission', 'terms of use',
-        'songselect', 'integrity', 'hosanna', '# ', 'based on the recording'
-    ]
-    return any(ind in line_lower for ind in footer_indicators)
+def is_footer_line(line: str, line_lower: Optional[str] = None) -> bool:
+    """Check if line is part of footer/legal content. Pass line_lower if already computed."""
+    if line_lower is None:
+        line_lower = line.lower()
+    # A plain loop beats any() over a generator here (and a regex alternation)
+    for indicator in FOOTER_INDICATORS:
+        if indicator in line_lower:
+            return True
+    return False
 
 
 def is_metadata_line(line: str) -> bool:
     """Check if line is metadata (key, tempo, time signature, etc.)."""
     line_stripped = line.strip()
     # Match lines like "Key - C | Tempo - 72 | Time - 3/4"
-    if re.match(r'^Key\s*[-–]', line_stripped, re.IGNORECASE):
+    if KEY_METADATA_RE.match(line_stripped):
         return True
-    if re.match(r'^Tempo\s*[-–]', line_stripped, re.IGNORECASE):
+    if TEMPO_METADATA_RE.match(line_stripped):
         return True
     return False
 
 
-def is_ignored_section_header(line: str) -> bool:
-    """Check if line is header of a section to ignore."""
-    line_upper = line.upper().strip()
+def is_ignored_section_header(line: str, line_upper: Optional[str] = None) -> bool:
+    """Check if line is header of a section to ignore. Pass line_upper if already computed."""
+    if line_upper is None:
+        line_upper = line.upper()
+    line_upper = line_upper.strip()
     # Remove brackets if present
-    line_upper = re.sub(r'[\[\]]', '', line_upper).strip()
+    line_upper = BRACKETS_RE.sub('', line_upper).strip()
     
-    for ignored in IGNORED_SECTIONS:
-        if line_upper == ignored or line_upper.startswith(ignored + ' '):
-            return True
-    return False
+    # Ignored names contain no spaces, so the first space-separated word
+    # matching one covers both "INTRO" and "INTRO 2"
+    return line_upper.split(' ', 1)[0] in IGNORED_SECTIONS
 
 
-def is_section_header(line: str) -> Optional[Tuple[str, str]]:
-    """Check if line is a section header. Returns (section_type, section_num) or None."""
+def is_section_header(line: str, line_upper: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """
+    Check if line is a section header. Returns (section_type, section_num) or None.
+    Pass line_upper (the stripped line, uppercased) if already computed.
+    """
     line_stripped = line.strip()
     
     # Handle [Verse 1] format
-    bracket_match = re.match(r'^\[(?P<type>Verse|Chorus|Vamp|Bridge|Pre-Chorus|Tag)\s*(?P<num>\d*[A-Z]?)\]', 
-                              line_stripped, re.IGNORECASE)
+    bracket_match = BRACKET_HEADER_RE.match(line_stripped)
     if bracket_match:
         return (bracket_match.group('type').upper(), bracket_match.group('num'))
     
     # Handle VERSE 1, CHORUS, CHORUS 1A, CHORUS 1B, etc. (standalone)
-    line_upper = line_stripped.upper()
-    for section in VALID_SECTIONS:
-        if line_upper == section:
-            return (section, '')
-        # Match "CHORUS 1A", "VERSE 2", etc.
-        match = re.match(rf'^{section}\s*(\d*[A-Z]?)$', line_upper)
-        if match:
-            return (section, match.group(1))
+    if line_upper is None:
+        line_upper = line_stripped.upper()
+    match = SECTION_HEADER_RE.match(line_upper)
+    if match:
+        return (match.group('type'), match.group('num'))
     
     return None
 
 
+def _split_joined_words(match) -> str:
+    """Replacement callback for JOINED_WORDS_RE."""
+    group = match.lastgroup
+    if group == 'camel':
+        return match.group('camel') + ' '
+    return JOINED_WORDS_REPLACEMENTS[group]
+
+
+def _match_case(original: str, replacement: str) -> str:
+    """Copy the capitalization of original onto replacement."""
+    if original.isupper() and len(original) > 1:
+        return replacement.upper()
+    if original[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+
+def _fix_ligature(match) -> str:
+    """Replacement callback for LIGATURE_RE."""
+    word = match.group(1)
+    if word:
+        return _match_case(word, LIGATURE_WORD_FIXES[word.lower()])
+    return 'fulfilled' if match.group(2) else 'filled'
+
+
 def clean_lyrics_line(line: str) -> Optional[str]:
     """Clean a single line of lyrics. Returns None if line should be skipped."""
     line = line.strip()
@@ -177,12 +388,16 @@ def clean_lyrics_line(line: str) -> Optional[str]:
     if not line:
         return None
     
+    # Case variants shared by the predicates below
+    line_lower = line.lower()
+    line_upper = line.upper()
+    
     # Skip chord-only lines
     if is_chord_line(line):
         return None
     
     # Skip footer lines
-    if is_footer_line(line):
+    if is_footer_line(line, line_lower):
         return None
     
     # Skip metadata lines
@@ -190,37 +405,30 @@ def clean_lyrics_line(line: str) -> Optional[str]:
         return None
     
     # Skip lines that are just "Lai, lai" or similar
-    if re.match(r'^[Ll]ai[\s,lai-]+$', line, re.IGNORECASE):
+    if LAI_LINE_RE.match(line):
         return None
     
     # Skip section headers (they'll be handled separately)
-    if is_section_header(line):
+    if is_section_header(line, line_upper):
         return None
-    if is_ignored_section_header(line):
+    if is_ignored_section_header(line, line_upper):
         return None
     
     # Skip navigation/direction markers
-    for nav_pattern in NAVIGATION_PATTERNS:
-        if re.search(nav_pattern, line, re.IGNORECASE):
-            return None
+    if NAVIGATION_RE.search(line):
+        return None
     
     # Split line into words
     words = line.split()
     cleaned_words = []
     
     for word in words:
-        # Strip whitespace from word (sometimes embedded in PDF extraction)
-        word = word.strip()
-        
-        if not word:
-            continue
-            
         # Skip standalone chord symbols
         if is_chord(word):
             continue
         
         # Skip chord fragments like "/E", "/G#"
-        if re.match(r'^/[A-G][#b]?$', word):
+        if CHORD_FRAGMENT_RE.match(word):
             continue
         
         # Keep the word
@@ -229,72 +437,45 @@ def clean_lyrics_line(line: str) -> Optional[str]:
     # Reconstruct the line
     cleaned = ' '.join(cleaned_words)
     
-    # Fix split words like "sor - rows" -> "sorrows", "per - sisted" -> "persisted"
-    cleaned = re.sub(r'(\w)\s+-\s+(\w)', r'\1\2', cleaned)
+    # Most lines are already clean; skip the repair passes entirely.
+    # Chord stripping only drops whole words, so probing the full lowercased
+    # line for merged words is safe. Non-ASCII lines take the full path since
+    # IGNORECASE also folds a few non-ASCII letters onto ASCII ones.
+    if (
+        line.isascii()
+        and not NEEDS_REPAIR_RE.search(cleaned)
+        and not MERGED_WORD_PROBE_RE.search(line_lower)
+    ):
+        return cleaned if len(cleaned) >= 2 else None
+    
+    # The dash repairs below can only fire on lines containing a dash
+    has_dash = '-' in cleaned
     
-    # Fix "A - men" -> "Amen"
-    cleaned = re.sub(r'^-\s*men$', 'Amen', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\bA\s*-\s*men\b', 'Amen', cleaned, flags=re.IGNORECASE)
+    # Fix split words like "sor - rows" -> "sorrows", "per - sisted" -> "persisted"
+    if has_dash:
+        cleaned = SPLIT_WORD_RE.sub(r'\1\2', cleaned)
+        
+        # Fix "A - men" -> "Amen"
+        cleaned = DASH_MEN_RE.sub('Amen', cleaned)
+        cleaned = A_MEN_RE.sub('Amen', cleaned)
     
     # Fix words stuck together like "joy'sgonna" -> "joy's gonna"
-    cleaned = re.sub(r"'s(?=[a-z])", "'s ", cleaned)
+    if "'s" in cleaned:
+        cleaned = POSSESSIVE_JOIN_RE.sub("'s ", cleaned)
     
     # Fix "de - stroyed" -> "destroyed" (remaining dashes between word parts)
-    cleaned = re.sub(r'\s+-\s+', '', cleaned)
-    
-    # Fix common merged word patterns (PDF extraction issues)
-    # Add space before comma-joined words: "everlasting,You" -> "everlasting, You"
-    cleaned = re.sub(r',([A-Z])', r', \1', cleaned)
-    cleaned = re.sub(r',([a-z])', r', \1', cleaned)  # Also lowercase
-    
-    # camelCase splits
-    cleaned = re.sub(r'([a-z])([A-Z])', r'\1 \2', cleaned)
-    
-    # Fix common merged word patterns (lowercase)
-    # Words ending in common suffixes that get merged with next word
-    common_word_endings = [
-        (r'Jesus([a-z])', r'Jesus \1'),  # Jesuswalked -> Jesus walked
-        (r'wondrous([a-z])', r'wondrous \1'),  # wondrousfaith -> wondrous faith
-        (r'daily([a-z])', r'daily \1'),  # dailyin -> daily in
-        (r'never([a-z])', r'never \1'),  # neverfully -> never fully
-        (r'unchanging([a-z])', r'unchanging \1'),  # unchanginglove -> unchanging love
-        (r'Saviour([a-z])', r'Saviour \1'),  # Saviourprayed -> Saviour prayed
-        (r'Savior([a-z])', r'Savior \1'),  # American spelling
-        (r'glory([a-z])', r'glory \1'),  # gloryat -> glory at
-        (r'lifted([a-z])', r'lifted \1'),  # liftedhigh -> lifted high
-        (r'everlasting([a-z])', r'everlasting \1'),  # everlastingYou -> everlasting You
-        (r'heaven([a-z])', r'heaven \1'),  # heavenso -> heaven so
-        (r'kingdom([a-z])', r'kingdom \1'),  # kingdomfirst -> kingdom first
-        (r'summer([a-z])', r'summer \1'),  # summerfilled -> summer filled
-        (r'thousand([a-z])', r'thousand \1'),
-        (r'ransomed([a-z])', r'ransomed \1'),  # ransomedglory -> ransomed glory
-    ]
+    if has_dash:
+        cleaned = SPACED_DASH_RE.sub('', cleaned)
     
-    for pattern, replacement in common_word_endings:
-        cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
-    
-    # Fix missing ligatures (fi, fl, ff, etc.) - common PDF extraction issue
-    # These often appear as missing characters
-    ligature_fixes = [
-        (r'\brst\b', 'first'),  # rst -> first
-        (r'  ght\b', ' fight'),  # "  ght" -> " fight" (with double space before)
-        (r'\bght\b', 'fight'),  # ght -> fight (when standalone)
-        (r'lled\b', 'filled'),  # lled -> filled
-        (r'\bnd\b', 'find'),  # nd -> find (when standalone)
-        (r'ful lled', 'fulfilled'),  # ful lled -> fulfilled
-        (r'\beort\b', 'effort'),  # eort -> effort (missing ff)
-        (r'\becting\b', 'effecting'),  # ecting -> effecting
-        (r'\bects\b', 'effects'),  # ects -> effects
-    ]
+    # Fix merged words (PDF extraction issues) in one pass:
+    # "everlasting,You" -> "everlasting, You", camelCase splits, "Jesuswalked" -> "Jesus walked"
+    cleaned = JOINED_WORDS_RE.sub(_split_joined_words, cleaned)
     
-    for pattern, replacement in ligature_fixes:
-        cleaned = re.sub(pattern, replacement, cleaned)
+    # Fix missing ligatures (fi, fl, ff, etc.)
+    cleaned = LIGATURE_RE.sub(_fix_ligature, cleaned)
     
     # Clean up any double spaces that may have been introduced
-    cleaned = re.sub(r'\s{2,}', ' ', cleaned)
-    
-    # Clean up extra spaces
-    cleaned = re.sub(r'\s{2,}', ' ', cleaned)
+    cleaned = MULTI_SPACE_RE.sub(' ', cleaned)
     cleaned = cleaned.strip()
     
     # Skip if line is too short after cleaning
@@ -305,58 +486,121 @@ def clean_lyrics_line(line: str) -> Optional[str]:
 
 
 def extract_columns_from_page(page) -> Tuple[List[str], List[str]]:
-    """Extract text from page as two columns based on position."""
-    width = page.width
+    """Extract text from a pdfplumber page as two columns based on position."""
+    return extract_columns_from_words(page.extract_words(), page.width)
+
+
+def extract_pymupdf_words(page) -> List[dict]:
+    """Extract words from a PyMuPDF page in pdfplumber's word dict format."""
+    return [
+        {'text': text, 'x0': x0, 'top': y0}
+        for x0, y0, _x1, _y1, text, *_ in page.get_text('words')
+    ]
+
+
+def extract_pdfium_words(page) -> List[dict]:
+    """Extract words from a pypdfium2 page in pdfplumber's word dict format."""
+    textpage = page.get_textpage()
+    height = page.get_height()
+    words = []
+    try:
+        for i in range(textpage.count_rects()):
+            # Rects are in PDF space (origin bottom-left); flip to pdfplumber's top
+            left, bottom, right, top = textpage.get_rect(i)
+            segment = textpage.get_text_bounded(left, bottom, right, top)
+            # Words in one segment share its x0; stable sorts keep their order
+            for text in segment.split():
+                words.append({'text': text, 'x0': left, 'top': height - top})
+    finally:
+        textpage.close()
+    return words
+
+
+def _join_line(words: List[dict]) -> str:
+    """Join one line's words left to right, stripping null/control characters."""
+    # Nulls are removed once per line rather than once per word
+    return ' '.join(
+        word['text'].strip() for word in sorted(words, key=WORD_X0_KEY)
+    ).replace('\x00', '')
+
+
+def _group_into_lines(words: List[dict], threshold: float = LINE_TOP_THRESHOLD) -> List[str]:
+    """Group words into text lines by vertical position."""
+    if not words:
+        return []
+    
+    words = sorted(words, key=WORD_POSITION_KEY)
+    
+    # Tops are sorted, so a line breaks wherever the gap to the previous
+    # word reaches the threshold; slice between the breaks
+    tops = [w['top'] for w in words]
+    starts = [i for i in range(1, len(tops)) if tops[i] - tops[i - 1] >= threshold]
+    bounds = [0] + starts + [len(words)]
+    
+    return [_join_line(words[a:b]) for a, b in zip(bounds, bounds[1:])]
+
+
+def _extract_columns_numpy(words: List[dict], mid: float) -> Tuple[List[str], List[str]]:
+    """
+    Vectorized column split and line grouping.
+    
+    Produces exactly the same lines as the pure-Python path: stable sorts
+    by (top, x0), a new line wherever consecutive tops jump by the threshold,
+    then each line is ordered by x0.
+    """
+    arr = np.fromiter(
+        ((w['x0'], w['top']) for w in words),
+        dtype=[('x0', 'f8'), ('top', 'f8')],
+        count=len(words)
+    )
+    x0, top = arr['x0'], arr['top']
+    left_mask = x0 < mid
+    
+    columns = []
+    for mask in (left_mask, ~left_mask):
+        idx = np.flatnonzero(mask)
+        if not idx.size:
+            columns.append([])
+            continue
+        
+        # Sort by (top, x0); a new line starts wherever tops jump by the threshold
+        order = idx[np.lexsort((x0[idx], top[idx]))]
+        line_ids = np.concatenate(([0], np.cumsum(np.diff(top[order]) >= LINE_TOP_THRESHOLD)))
+        
+        # Reorder each line by x0 in one sort, keeping (top, x0) order for ties
+        order = order[np.lexsort((top[order], x0[order], line_ids))]
+        starts = np.flatnonzero(np.diff(line_ids)) + 1
+        
+        texts = [words[i]['text'].strip() for i in order.tolist()]
+        bounds = [0] + starts.tolist() + [len(texts)]
+        lines = [' '.join(texts[a:b]).replace('\x00', '') for a, b in zip(bounds, bounds[1:])]
+        columns.append(lines)
+    
+    return columns[0], columns[1]
+
+
+def extract_columns_from_words(words: List[dict], width: float) -> Tuple[List[str], List[str]]:
+    """Split positioned words into left and right column lines."""
     mid = width / 2
     
-    words = page.extract_words()
     if not words:
         return [], []
     
+    if NUMPY_AVAILABLE and len(words) >= NUMPY_MIN_WORDS:
+        return _extract_columns_numpy(words, mid)
+    
     # Separate into left and right columns
     left_words = [w for w in words if w['x0'] < mid]
     right_words = [w for w in words if w['x0'] >= mid]
     
-    def group_into_lines(words, threshold=5):
-        if not words:
-            return []
-        
-        words = sorted(words, key=lambda w: (w['top'], w['x0']))
-        
-        lines = []
-        current_line = [words[0]]
-        
-        for w in words[1:]:
-            if abs(w['top'] - current_line[-1]['top']) < threshold:
-                current_line.append(w)
-            else:
-                # Strip each word and remove null/control characters
-                line_text = ' '.join(
-                    word['text'].strip().replace('\x00', '') 
-                    for word in sorted(current_line, key=lambda x: x['x0'])
-                )
-                lines.append(line_text)
-                current_line = [w]
-        
-        if current_line:
-            # Strip each word and remove null/control characters
-            line_text = ' '.join(
-                word['text'].strip().replace('\x00', '') 
-                for word in sorted(current_line, key=lambda x: x['x0'])
-            )
-            lines.append(line_text)
-        
-        return lines
-    
-    left_lines = group_into_lines(left_words)
-    right_lines = group_into_lines(right_words)
-    
-    return left_lines, right_lines
+    return _group_into_lines(left_words), _group_into_lines(right_words)
 
 
-def parse_lines_for_sections(lines: List[str]) -> Dict[str, str]:
-    """Parse a list of lines to extract sections."""
-    sections = {}
+def iter_sections(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (section_key, lyrics) for each section in a column, in order.
+    Lines are cleaned as they are consumed, so lines may be any iterable.
+    """
     current_section = None
     current_lyrics = []
     in_ignored_section = False
@@ -365,9 +609,7 @@ def parse_lines_for_sections(lines: List[str]) -> Dict[str, str]:
         # Check if this is an ignored section header
         if is_ignored_section_header(line):
             if current_section and current_lyrics:
-                lyrics_text = '\n'.join(current_lyrics)
-                if lyrics_text.strip():
-                    sections[current_section] = lyrics_text
+                yield current_section, '\n'.join(current_lyrics)
             current_section = None
             current_lyrics = []
             in_ignored_section = True
@@ -377,9 +619,7 @@ def parse_lines_for_sections(lines: List[str]) -> Dict[str, str]:
         section_info = is_section_header(line)
         if section_info:
             if current_section and current_lyrics:
-                lyrics_text = '\n'.join(current_lyrics)
-                if lyrics_text.strip():
-                    sections[current_section] = lyrics_text
+                yield current_section, '\n'.join(current_lyrics)
             
             section_type, section_num = section_info
             current_section = normalize_section_key(section_type, section_num)
@@ -392,74 +632,234 @@ def parse_lines_for_sections(lines: List[str]) -> Dict[str, str]:
             continue
         
         # If we're in a valid section, try to add this line
+        # (cleaned lines are never blank, so joined lyrics aren't either)
         if current_section:
             cleaned = clean_lyrics_line(line)
             if cleaned:
                 current_lyrics.append(cleaned)
     
-    # Save the last section
+    # Emit the last section
     if current_section and current_lyrics:
-        lyrics_text = '\n'.join(current_lyrics)
-        if lyrics_text.strip():
-            sections[current_section] = lyrics_text
+        yield current_section, '\n'.join(current_lyrics)
+
+
+def parse_lines_for_sections(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    Parse a list of lines to extract sections.
+    A section key repeated within the column keeps its last lyrics.
+    """
+    return dict(iter_sections(lines))
+
+
+def _resolve_backend(backend: str) -> str:
+    """Resolve 'auto' and check the requested PDF backend is usable."""
+    if backend == 'auto':
+        if PYMUPDF_AVAILABLE:
+            backend = 'pymupdf'
+        elif PDFIUM_AVAILABLE:
+            backend = 'pdfium'
+        else:
+            backend = 'pdfplumber'
+    if backend == 'pymupdf' and not PYMUPDF_AVAILABLE:
+        raise ImportError("PyMuPDF is not installed (pip install pymupdf)")
+    if backend == 'pdfium' and not PDFIUM_AVAILABLE:
+        raise ImportError("pypdfium2 is not installed (pip install pypdfium2)")
+    if backend not in ('pymupdf', 'pdfium', 'pdfplumber'):
+        raise ValueError(f"Unknown PDF backend: {backend}")
+    return backend
+
+
+def iter_page_columns(pdf_source: Union[str, BinaryIO], backend: str = 'auto'):
+    """
+    Yield (left_lines, right_lines) for each page of a PDF.
     
-    return sections
+    backend is 'pymupdf', 'pdfium', 'pdfplumber', or 'auto' (the fastest
+    one installed, in that order).
+    """
+    backend = _resolve_backend(backend)
+    
+    if backend == 'pymupdf':
+        if isinstance(pdf_source, str):
+            doc = pymupdf.open(pdf_source)
+        else:
+            doc = pymupdf.open(stream=pdf_source.read(), filetype='pdf')
+        with doc:
+            for page in doc:
+                yield extract_columns_from_words(extract_pymupdf_words(page), page.rect.width)
+    elif backend == 'pdfium':
+        source = pdf_source if isinstance(pdf_source, str) else pdf_source.read()
+        doc = pdfium.PdfDocument(source)
+        try:
+            for page in doc:
+                yield extract_columns_from_words(extract_pdfium_words(page), page.get_width())
+        finally:
+            doc.close()
+    else:
+        with pdfplumber.open(pdf_source) as pdf:
+            for page in pdf.pages:
+                yield extract_columns_from_page(page)
+
+
+def _parse_cache_path(cache_dir: str, data: bytes, backend: str) -> str:
+    """Path of the cached result for this PDF content and backend."""
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f"{digest}-{backend}.json")
+
+
+def _load_cached_sections(path: str) -> Optional[Dict[str, str]]:
+    """Read cached sections, or None if missing, unreadable or stale."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get('version') != PARSE_CACHE_VERSION:
+        return None
+    return payload.get('sections')
+
 
+def _save_cached_sections(path: str, sections: Dict[str, str]) -> None:
+    """Write sections to the cache; failures only cost a re-parse later."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': PARSE_CACHE_VERSION, 'sections': sections}, f)
+        # Atomic rename so concurrent workers never see a half-written file
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
 
-def parse_pdf(pdf_path: str) -> Dict[str, str]:
+
+def parse_pdf(
+    pdf_source: Union[str, BinaryIO],
+    backend: str = 'auto',
+    cache_dir: Optional[str] = None
+) -> Dict[str, str]:
     """
     Main function to parse a PDF and extract sections.
     Handles two-column layouts by parsing columns separately.
+    
+    Accepts either a file path or a binary file-like object. Uses PyMuPDF
+    or pypdfium2 when available; pass backend='pdfplumber' for PDFs they
+    handle poorly.
+    With cache_dir set, results are cached there keyed by a hash of the
+    PDF's content.
     """
+    backend = _resolve_backend(backend)
+    cache_path = None
+    
+    if cache_dir:
+        if isinstance(pdf_source, str):
+            with open(pdf_source, 'rb') as f:
+                data = f.read()
+        else:
+            data = pdf_source.read()
+        pdf_source = io.BytesIO(data)
+        
+        cache_path = _parse_cache_path(cache_dir, data, backend)
+        cached = _load_cached_sections(cache_path)
+        if cached is not None:
+            return cached
+    
+    # Parse lazily so only one page's sections are alive at a time
+    page_sections = (
+        (parse_lines_for_sections(left_lines), parse_lines_for_sections(right_lines))
+        for left_lines, right_lines in iter_page_columns(pdf_source, backend)
+    )
+    
+    # Merge sections page by page, left column before right; first one wins
     all_sections = {}
+    for left_sections, right_sections in page_sections:
+        for key, lyrics in left_sections.items():
+            if key not in all_sections:
+                all_sections[key] = lyrics
+        
+        for key, lyrics in right_sections.items():
+            if key not in all_sections:
+                all_sections[key] = lyrics
     
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            # Extract both columns
-            left_lines, right_lines = extract_columns_from_page(page)
-            
-            # Parse each column for sections
-            left_sections = parse_lines_for_sections(left_lines)
-            right_sections = parse_lines_for_sections(right_lines)
-            
-            # Merge sections
-            for key, lyrics in left_sections.items():
-                if key not in all_sections:
-                    all_sections[key] = lyrics
-            
-            for key, lyrics in right_sections.items():
-                if key not in all_sections:
-                    all_sections[key] = lyrics
+    if cache_path:
+        _save_cached_sections(cache_path, all_sections)
     
     return all_sections
 
 
+def parse_pdf_bytes(
+    data: bytes,
+    backend: str = 'auto',
+    cache_dir: Optional[str] = None
+) -> Dict[str, str]:
+    """Parse a PDF held in memory (e.g. an upload) without writing it to disk."""
+    return parse_pdf(io.BytesIO(data), backend, cache_dir)
+
+
+def parse_many_pdf_bytes(
+    datas: List[bytes],
+    max_workers: int = 4,
+    cache_dir: Optional[str] = None,
+    backend: str = 'auto',
+    parallel: bool = False
+) -> List[Union[Dict[str, str], Exception]]:
+    """
+    Parse several in-memory PDFs.
+    
+    Results come back in input order; a PDF that fails to parse yields its
+    exception instead of sections so one bad file doesn't sink the rest.
+    With parallel=True, pdfplumber PDFs are parsed in worker processes;
+    PyMuPDF and pypdfium2 finish a PDF faster than a worker starts, so they
+    always parse in-process.
+    """
+    backend = _resolve_backend(backend)
+    if not parallel or backend != 'pdfplumber' or len(datas) <= 1:
+        results = []
+        for data in datas:
+            try:
+                results.append(parse_pdf_bytes(data, backend, cache_dir=cache_dir))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    workers = min(max_workers, len(datas), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(parse_pdf_bytes, data, backend, cache_dir=cache_dir)
+            for data in datas
+        ]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+
 def get_song_title_from_filename(filename: str) -> str:
     """Extract song title from filename, removing number prefix, key suffix, and extra notes."""
-    import os
     name = os.path.splitext(os.path.basename(filename))[0]
     
     # Remove leading number and dot (e.g., "1. Song Name" -> "Song Name")
-    name = re.sub(r'^\d+\.\s*', '', name)
+    name = TITLE_NUMBER_PREFIX_RE.sub('', name)
     
     # Remove "-chords-X" and everything after (e.g., "Song-chords-D" or "Song-chords-F (2)" -> "Song")
-    name = re.sub(r'-chords-[A-G][#b]?.*$', '', name, flags=re.IGNORECASE)
+    name = TITLE_CHORDS_SUFFIX_RE.sub('', name)
     
     # Remove trailing version numbers like (1), (2), etc.
-    name = re.sub(r'\s*\(\d+\)\s*$', '', name)
+    name = TITLE_VERSION_RE.sub('', name)
     
     # Remove parenthetical alternate titles/attributions at the end
     # e.g., "Rock Of Ages (Toplady)" -> "Rock Of Ages"
     # e.g., "Victory In Jesus (Christ Won The Victory)" -> "Victory In Jesus"
-    name = re.sub(r'\s*\([^)]+\)\s*$', '', name)
+    name = TITLE_PARENTHETICAL_RE.sub('', name)
     
     # Remove "-X" key suffix at end (e.g., "Song - D" or "Song-D" -> "Song")
-    name = re.sub(r'\s*-\s*[A-G][#b]?(?:~[A-G][#b]?)?\s*$', '', name)
+    name = TITLE_KEY_SUFFIX_RE.sub('', name)
     
     # Remove trailing " - Key" patterns (e.g., "Song - Key of D" -> "Song")
-    name = re.sub(r'\s*-\s*(?:key\s+(?:of\s+)?)?[A-G][#b]?(?:m|maj|min)?\s*$', '', name, flags=re.IGNORECASE)
+    name = TITLE_KEY_OF_RE.sub('', name)
     
     # Clean up any double spaces
-    name = re.sub(r'\s{2,}', ' ', name)
+    name = MULTI_SPACE_RE.sub(' ', name)
     
     return name.strip()
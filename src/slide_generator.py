@@ -8,15 +8,27 @@ Formatting specs:
 - Max 4 lines per slide
 """
 
+import functools
+import json
 import os
-from datetime import datetime
-from typing import List, Tuple, Optional
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional
 
+from google.auth.exceptions import RefreshError
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
+
+# orjson serializes large batchUpdate bodies several times faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Google Slides API scope + Drive for moving files
 SCOPES = [
@@ -27,6 +39,10 @@ SCOPES = [
 # Default folder ID for saving presentations
 DEFAULT_FOLDER_ID = '1KdrZ4MvpyJziT74aAtWkWcKOgtVClpLh'
 
+# Optional presentation with no slides to copy instead of creating a fresh
+# one; set LYRICASTER_TEMPLATE_ID to its Drive file ID
+DEFAULT_TEMPLATE_ID = os.environ.get('LYRICASTER_TEMPLATE_ID')
+
 # Slide dimensions (in EMU - English Metric Units, 914400 EMU = 1 inch)
 # Standard 16:9 slide: 10 inches x 5.625 inches
 SLIDE_WIDTH = 9144000  # 10 inches in EMU
@@ -37,15 +53,127 @@ BLACK_RGB = {'red': 0, 'green': 0, 'blue': 0}
 TITLE_COLOR_RGB = {'red': 0.29, 'green': 0.525, 'blue': 0.91}  # #4a86e8
 WHITE_RGB = {'red': 1, 'green': 1, 'blue': 1}
 
+# Very large decks are sent in several batchUpdate calls of at most this
+# many requests, so no single call risks the API's request size limit
+MAX_REQUESTS_PER_BATCH = 1000
+
+# Retries for 429 / 5xx responses; googleapiclient backs off exponentially
+# with jitter between attempts
+API_RETRIES = 5
+
+# Cached credentials are refreshed when they have less than this left
+CREDENTIALS_REFRESH_MARGIN = timedelta(seconds=60)
+
+# Serializes loading and refreshing the shared Credentials across sessions
+_credentials_lock = threading.Lock()
+
 # Font settings
 FONT_FAMILY = 'Calibri'
 FONT_SIZE_PT = 40
 
+# Request fragments shared by every slide. They are referenced rather than
+# rebuilt per slide; requests are only serialized, never mutated.
+BLACK_BACKGROUND = {
+    'pageBackgroundFill': {
+        'solidFill': {
+            'color': {
+                'rgbColor': BLACK_RGB
+            }
+        }
+    }
+}
+TEXT_BOX_WIDTH = {'magnitude': SLIDE_WIDTH - 400000, 'unit': 'EMU'}
 
-def get_credentials(credentials_path: str = 'credentials.json', token_path: str = 'token.json') -> Credentials:
+# Title: Calibri 40pt, #4a86e8, underlined
+TITLE_TEXT_STYLE = {
+    'fontFamily': FONT_FAMILY,
+    'fontSize': {
+        'magnitude': FONT_SIZE_PT,
+        'unit': 'PT'
+    },
+    'foregroundColor': {
+        'opaqueColor': {
+            'rgbColor': TITLE_COLOR_RGB
+        }
+    },
+    'underline': True,
+    'bold': False
+}
+TITLE_STYLE_FIELDS = 'fontFamily,fontSize,foregroundColor,underline,bold'
+
+# Body: Calibri 40pt, white
+BODY_TEXT_STYLE = {
+    'fontFamily': FONT_FAMILY,
+    'fontSize': {
+        'magnitude': FONT_SIZE_PT,
+        'unit': 'PT'
+    },
+    'foregroundColor': {
+        'opaqueColor': {
+            'rgbColor': WHITE_RGB
+        }
+    },
+    'bold': False
+}
+BODY_STYLE_FIELDS = 'fontFamily,fontSize,foregroundColor,bold'
+
+# Footer: Calibri 20pt, blue, italic
+FOOTER_TEXT_STYLE = {
+    'fontFamily': FONT_FAMILY,
+    'fontSize': {
+        'magnitude': 20,
+        'unit': 'PT'
+    },
+    'foregroundColor': {
+        'opaqueColor': {
+            'rgbColor': TITLE_COLOR_RGB
+        }
+    },
+    'italic': True
+}
+FOOTER_STYLE_FIELDS = 'fontFamily,fontSize,foregroundColor,italic'
+
+CENTER_ALIGNMENT = {'alignment': 'CENTER'}
+RIGHT_ALIGNMENT = {'alignment': 'END'}
+
+
+class SlideSpec(NamedTuple):
+    """One slide's text. Plain (title, body[, footer]) tuples are accepted too."""
+    title: str
+    body: str
+    footer: str = ''
+
+
+class NewPresentation(NamedTuple):
+    """IDs from a freshly created presentation."""
+    presentation_id: str
+    default_slide_ids: List[str]
+    master_ids: List[str]
+    layout_ids: List[str]  # the BLANK layout(s) our slides are created from
+
+
+def _save_token(creds: Credentials, token_path: str) -> None:
+    """Write the token via a temp file and rename, so readers never see half a file."""
+    token_dir = os.path.dirname(os.path.abspath(token_path))
+    with tempfile.NamedTemporaryFile('w', dir=token_dir, suffix='.tmp', delete=False) as token:
+        token.write(creds.to_json())
+    os.replace(token.name, token_path)
+
+
+def _token_mtime(token_path: str) -> Optional[int]:
+    """Modification time of token.json in ns, or None if it doesn't exist."""
+    try:
+        return os.stat(token_path).st_mtime_ns
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_credentials(credentials_path: str, token_path: str, token_mtime: Optional[int]) -> Credentials:
     """
-    Get Google API credentials.
-    Will prompt for OAuth if needed.
+    Load credentials from disk, prompting for OAuth if needed.
+    Cached so token.json is only parsed once per version of the file;
+    token_mtime is part of the cache key for that reason.
     """
     creds = None
     
@@ -56,71 +184,258 @@ def get_credentials(credentials_path: str = 'credentials.json', token_path: str
     # If no valid creds, get new ones
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
+            from google.auth.transport.requests import Request
+            try:
+                creds.refresh(Request())
+            except RefreshError:
+                # Refresh token revoked or expired; authorize again
+                creds = None
+        if not creds or not creds.valid:
             if not os.path.exists(credentials_path):
                 raise FileNotFoundError(
                     f"Credentials file not found: {credentials_path}\n"
                     "Please download OAuth credentials from Google Cloud Console.\n"
                     "See README.md for setup instructions."
                 )
+            # Only needed for first-time OAuth; slow to import
+            from google_auth_oauthlib.flow import InstalledAppFlow
             flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
             creds = flow.run_local_server(port=0)
         
         # Save credentials for next time
-        with open(token_path, 'w') as token:
-            token.write(creds.to_json())
+        _save_token(creds, token_path)
     
     return creds
 
 
-def create_presentation(title: str, creds: Credentials) -> str:
+def get_credentials(credentials_path: str = 'credentials.json', token_path: str = 'token.json') -> Credentials:
     """
-    Create a new Google Slides presentation.
-    Returns the presentation ID.
+    Get Google API credentials.
+    Will prompt for OAuth if needed.
+    
+    The same Credentials object is returned until token.json changes on
+    disk; it is refreshed in place shortly before it expires.
+    """
+    with _credentials_lock:
+        creds = _load_credentials(credentials_path, token_path, _token_mtime(token_path))
+        
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if creds.expiry and creds.expiry - now < CREDENTIALS_REFRESH_MARGIN:
+            if creds.refresh_token:
+                from google.auth.transport.requests import Request
+                try:
+                    creds.refresh(Request())
+                    _save_token(creds, token_path)
+                    return creds
+                except RefreshError:
+                    pass
+            # Nothing to refresh with, or the refresh token was rejected;
+            # start over from disk / OAuth
+            _load_credentials.cache_clear()
+            creds = _load_credentials(credentials_path, token_path, _token_mtime(token_path))
+        
+        return creds
+
+
+class CompactJsonModel(JsonModel):
+    """
+    JsonModel that writes request bodies without whitespace.
+    
+    Uses orjson when installed, for responses as well. Its output is UTF-8
+    bytes rather than an ASCII-escaped str, which the HTTP layer sends as-is.
+    """
+    
+    def serialize(self, body_value):
+        if isinstance(body_value, dict) and 'data' not in body_value and self._data_wrapper:
+            body_value = {'data': body_value}
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(body_value)
+        return json.dumps(body_value, separators=(',', ':'))
+    
+    def deserialize(self, content):
+        if not ORJSON_AVAILABLE:
+            return super().deserialize(content)
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Non-JSON bodies are returned as text, as JsonModel does
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+
+def build_service(api: str, version: str, creds: Credentials):
     """
-    service = build('slides', 'v1', credentials=creds)
+    Build a Google API client.
     
+    Uses the discovery document bundled with google-api-python-client, so
+    building never fetches it over the network. A client wraps an
+    httplib2.Http, which isn't thread-safe, so only one thread at a time
+    may use it.
+    """
+    return build(
+        api,
+        version,
+        credentials=creds,
+        model=CompactJsonModel(),
+        cache_discovery=False,
+        static_discovery=True
+    )
+
+
+def create_presentation(title: str, service) -> NewPresentation:
+    """
+    Create a new Google Slides presentation.
+    Returns its ID plus the object IDs of its default slides, masters and
+    BLANK layouts.
+    """
     presentation = {
         'title': title
     }
     
     presentation = service.presentations().create(body=presentation).execute()
-    return presentation.get('presentationId')
+    # The create response already lists the default blank slide, so it can be
+    # deleted in the same batchUpdate that adds ours without fetching it again
+    return NewPresentation(
+        presentation.get('presentationId'),
+        [slide.get('objectId') for slide in presentation.get('slides', [])],
+        [master.get('objectId') for master in presentation.get('masters', [])],
+        [
+            layout.get('objectId')
+            for layout in presentation.get('layouts', [])
+            if layout.get('layoutProperties', {}).get('name') == 'BLANK'
+        ]
+    )
+
+
+def copy_template(template_id: str, title: str, folder_id: Optional[str], drive_service) -> str:
+    """
+    Copy a slide-less template presentation, directly into folder_id if given.
+    Returns the new presentation's ID.
+    """
+    body = {'name': title}
+    if folder_id:
+        body['parents'] = [folder_id]
+    
+    copy = drive_service.files().copy(fileId=template_id, body=body, fields='id').execute()
+    return copy['id']
+
+
+def _text_box_requests(
+    object_id: str,
+    slide_id: str,
+    text: str,
+    height: int,
+    translate_y: int,
+    text_style: dict,
+    style_fields: str,
+    paragraph_style: dict
+) -> List[dict]:
+    """
+    Build the requests for one full-width styled text box on a slide.
+    
+    Returns createShape, insertText, updateTextStyle and updateParagraphStyle
+    requests; the style dicts are shared, not copied.
+    """
+    return [
+        {
+            'createShape': {
+                'objectId': object_id,
+                'shapeType': 'TEXT_BOX',
+                'elementProperties': {
+                    'pageObjectId': slide_id,
+                    'size': {
+                        'width': TEXT_BOX_WIDTH,
+                        'height': {'magnitude': height, 'unit': 'EMU'}
+                    },
+                    'transform': {
+                        'scaleX': 1,
+                        'scaleY': 1,
+                        'translateX': 200000,
+                        'translateY': translate_y,
+                        'unit': 'EMU'
+                    }
+                }
+            }
+        },
+        {
+            'insertText': {
+                'objectId': object_id,
+                'text': text,
+                'insertionIndex': 0
+            }
+        },
+        {
+            'updateTextStyle': {
+                'objectId': object_id,
+                'style': text_style,
+                'fields': style_fields
+            }
+        },
+        {
+            'updateParagraphStyle': {
+                'objectId': object_id,
+                'style': paragraph_style,
+                'fields': 'alignment'
+            }
+        },
+    ]
 
 
 def add_song_slides(
     presentation_id: str,
-    slides_data: List[Tuple[str, str, str]],
-    creds: Credentials
+    slides_data: List[SlideSpec],
+    service,
+    delete_object_ids: Optional[List[str]] = None,
+    master_ids: Optional[List[str]] = None,
+    layout_ids: Optional[List[str]] = None
 ) -> None:
     """
     Add slides to an existing presentation.
     
     Args:
         presentation_id: The Google Slides presentation ID
-        slides_data: List of (title, body, footer) tuples
-        creds: Google API credentials
+        slides_data: List of SlideSpec or (title, body[, footer]) tuples
+        service: Slides API client (see build_service)
+        delete_object_ids: Objects (e.g. the default slide) to delete first,
+            in the same batchUpdate
+        master_ids: Slide masters to paint black once
+        layout_ids: BLANK layouts to paint black once; slides inherit the
+            background from them instead of each setting it (default: per
+            slide). The layout is painted as well as the master because it
+            may set a fill of its own.
+    
+    Requests go out in one batchUpdate, or several for decks over
+    MAX_REQUESTS_PER_BATCH requests; a slide is never split across batches.
     """
-    service = build('slides', 'v1', credentials=creds)
+    batches = [[
+        {'deleteObject': {'objectId': object_id}}
+        for object_id in delete_object_ids or []
+    ]]
     
-    requests = []
+    # Set background to black on the masters and BLANK layouts slides inherit from
+    for page_id in (master_ids or []) + (layout_ids or []):
+        batches[0].append({
+            'updatePageProperties': {
+                'objectId': page_id,
+                'pageProperties': BLACK_BACKGROUND,
+                'fields': 'pageBackgroundFill'
+            }
+        })
     
-    for i, slide_tuple in enumerate(slides_data):
-        # Handle both (title, body) and (title, body, footer) formats
-        if len(slide_tuple) == 3:
-            title, body, footer = slide_tuple
-        else:
-            title, body = slide_tuple
-            footer = ''
+    for i, slide in enumerate(slides_data):
+        # SlideSpec defaults the footer, so (title, body) tuples work as well
+        title, body, footer = SlideSpec(*slide)
         
-        slide_id = f'slide_{i}'
-        title_id = f'title_{i}'
-        body_id = f'body_{i}'
-        footer_id = f'footer_{i}'
+        # Format the index once and share it across this slide's object IDs
+        index = str(i)
+        slide_id = 'slide_' + index
+        slide_requests = []
         
         # Create slide
-        requests.append({
+        slide_requests.append({
             'createSlide': {
                 'objectId': slide_id,
                 'insertionIndex': i,
@@ -130,22 +445,15 @@ def add_song_slides(
             }
         })
         
-        # Set background to black
-        requests.append({
-            'updatePageProperties': {
-                'objectId': slide_id,
-                'pageProperties': {
-                    'pageBackgroundFill': {
-                        'solidFill': {
-                            'color': {
-                                'rgbColor': BLACK_RGB
-                            }
-                        }
-                    }
-                },
-                'fields': 'pageBackgroundFill'
-            }
-        })
+        # Set background to black, unless it comes from the layout
+        if not layout_ids:
+            slide_requests.append({
+                'updatePageProperties': {
+                    'objectId': slide_id,
+                    'pageProperties': BLACK_BACKGROUND,
+                    'fields': 'pageBackgroundFill'
+                }
+            })
         
         # Only create title text box if there's title text
         if title and title.strip():
@@ -153,237 +461,61 @@ def add_song_slides(
             is_title_only = not (body and body.strip())
             title_y = (SLIDE_HEIGHT - 800000) // 2 if is_title_only else 300000
             
-            # Create title text box
-            requests.append({
-                'createShape': {
-                    'objectId': title_id,
-                    'shapeType': 'TEXT_BOX',
-                    'elementProperties': {
-                        'pageObjectId': slide_id,
-                        'size': {
-                            'width': {'magnitude': SLIDE_WIDTH - 400000, 'unit': 'EMU'},
-                            'height': {'magnitude': 800000, 'unit': 'EMU'}
-                        },
-                        'transform': {
-                            'scaleX': 1,
-                            'scaleY': 1,
-                            'translateX': 200000,
-                            'translateY': title_y,
-                            'unit': 'EMU'
-                        }
-                    }
-                }
-            })
-            
-            # Insert title text (UPPERCASE)
-            requests.append({
-                'insertText': {
-                    'objectId': title_id,
-                    'text': title.upper(),
-                    'insertionIndex': 0
-                }
-            })
-            
-            # Style title: Calibri 40pt, #4a86e8, underlined, centered
-            requests.append({
-                'updateTextStyle': {
-                    'objectId': title_id,
-                    'style': {
-                        'fontFamily': FONT_FAMILY,
-                        'fontSize': {
-                            'magnitude': FONT_SIZE_PT,
-                            'unit': 'PT'
-                        },
-                        'foregroundColor': {
-                            'opaqueColor': {
-                                'rgbColor': TITLE_COLOR_RGB
-                            }
-                        },
-                        'underline': True,
-                        'bold': False
-                    },
-                    'fields': 'fontFamily,fontSize,foregroundColor,underline,bold'
-                }
-            })
-            
-            # Center title
-            requests.append({
-                'updateParagraphStyle': {
-                    'objectId': title_id,
-                    'style': {
-                        'alignment': 'CENTER'
-                    },
-                    'fields': 'alignment'
-                }
-            })
+            # Title is UPPERCASE and centered
+            slide_requests.extend(_text_box_requests(
+                'title_' + index, slide_id, title.upper(), 800000, title_y,
+                TITLE_TEXT_STYLE, TITLE_STYLE_FIELDS, CENTER_ALIGNMENT
+            ))
         
         # Only create body text box if there's body text
         if body and body.strip():
-            # Create body text box
-            requests.append({
-                'createShape': {
-                    'objectId': body_id,
-                    'shapeType': 'TEXT_BOX',
-                    'elementProperties': {
-                        'pageObjectId': slide_id,
-                        'size': {
-                            'width': {'magnitude': SLIDE_WIDTH - 400000, 'unit': 'EMU'},
-                            'height': {'magnitude': 3500000, 'unit': 'EMU'}
-                        },
-                        'transform': {
-                            'scaleX': 1,
-                            'scaleY': 1,
-                            'translateX': 200000,
-                            'translateY': 1200000,
-                            'unit': 'EMU'
-                        }
-                    }
-                }
-            })
-            
-            # Insert body text
-            requests.append({
-                'insertText': {
-                    'objectId': body_id,
-                    'text': body,
-                    'insertionIndex': 0
-                }
-            })
-            
-            # Style body: Calibri 40pt, white, centered
-            requests.append({
-                'updateTextStyle': {
-                    'objectId': body_id,
-                    'style': {
-                        'fontFamily': FONT_FAMILY,
-                        'fontSize': {
-                            'magnitude': FONT_SIZE_PT,
-                            'unit': 'PT'
-                        },
-                        'foregroundColor': {
-                            'opaqueColor': {
-                                'rgbColor': WHITE_RGB
-                            }
-                        },
-                        'bold': False
-                    },
-                    'fields': 'fontFamily,fontSize,foregroundColor,bold'
-                }
-            })
-            
-            # Center body
-            requests.append({
-                'updateParagraphStyle': {
-                    'objectId': body_id,
-                    'style': {
-                        'alignment': 'CENTER'
-                    },
-                    'fields': 'alignment'
-                }
-            })
+            slide_requests.extend(_text_box_requests(
+                'body_' + index, slide_id, body, 3500000, 1200000,
+                BODY_TEXT_STYLE, BODY_STYLE_FIELDS, CENTER_ALIGNMENT
+            ))
         
         # Add footer (song title) - bottom right, italic, blue
         if footer and footer.strip():
-            # Create footer text box
-            requests.append({
-                'createShape': {
-                    'objectId': footer_id,
-                    'shapeType': 'TEXT_BOX',
-                    'elementProperties': {
-                        'pageObjectId': slide_id,
-                        'size': {
-                            'width': {'magnitude': SLIDE_WIDTH - 400000, 'unit': 'EMU'},
-                            'height': {'magnitude': 400000, 'unit': 'EMU'}
-                        },
-                        'transform': {
-                            'scaleX': 1,
-                            'scaleY': 1,
-                            'translateX': 200000,
-                            'translateY': SLIDE_HEIGHT - 500000,  # Near bottom
-                            'unit': 'EMU'
-                        }
-                    }
-                }
-            })
-            
-            # Insert footer text
-            requests.append({
-                'insertText': {
-                    'objectId': footer_id,
-                    'text': footer,
-                    'insertionIndex': 0
-                }
-            })
-            
-            # Style footer: Calibri 20pt, blue, italic
-            requests.append({
-                'updateTextStyle': {
-                    'objectId': footer_id,
-                    'style': {
-                        'fontFamily': FONT_FAMILY,
-                        'fontSize': {
-                            'magnitude': 20,
-                            'unit': 'PT'
-                        },
-                        'foregroundColor': {
-                            'opaqueColor': {
-                                'rgbColor': TITLE_COLOR_RGB
-                            }
-                        },
-                        'italic': True
-                    },
-                    'fields': 'fontFamily,fontSize,foregroundColor,italic'
-                }
-            })
-            
-            # Right-align footer
-            requests.append({
-                'updateParagraphStyle': {
-                    'objectId': footer_id,
-                    'style': {
-                        'alignment': 'END'  # Right align
-                    },
-                    'fields': 'alignment'
-                }
-            })
+            slide_requests.extend(_text_box_requests(
+                'footer_' + index, slide_id, footer, 400000, SLIDE_HEIGHT - 500000,  # Near bottom
+                FOOTER_TEXT_STYLE, FOOTER_STYLE_FIELDS, RIGHT_ALIGNMENT
+            ))
     
-    # Execute all requests
-    if requests:
-        body = {'requests': requests}
-        service.presentations().batchUpdate(
-            presentationId=presentation_id,
-            body=body
-        ).execute()
-
-
-def delete_default_slide(presentation_id: str, creds: Credentials) -> None:
-    """Delete the default blank slide created with new presentations."""
-    service = build('slides', 'v1', credentials=creds)
+        # Start a new batch rather than split this slide's requests
+        if batches[-1] and len(batches[-1]) + len(slide_requests) > MAX_REQUESTS_PER_BATCH:
+            batches.append([])
+        batches[-1].extend(slide_requests)
     
-    # Get the presentation to find the default slide
-    presentation = service.presentations().get(presentationId=presentation_id).execute()
-    slides = presentation.get('slides', [])
-    
-    if slides:
-        # Delete the first slide (default blank slide)
-        requests = [{
-            'deleteObject': {
-                'objectId': slides[0].get('objectId')
-            }
-        }]
-        
-        service.presentations().batchUpdate(
-            presentationId=presentation_id,
-            body={'requests': requests}
-        ).execute()
+    # Execute batches in order so each slide's insertionIndex is valid.
+    # Retrying a batch can't duplicate slides: object IDs are fixed, so a
+    # batch that did apply is rejected rather than applied twice.
+    for requests in batches:
+        if requests:
+            body = {'requests': requests}
+            service.presentations().batchUpdate(
+                presentationId=presentation_id,
+                body=body
+            ).execute(num_retries=API_RETRIES)
 
 
-def move_to_folder(file_id: str, folder_id: str, creds: Credentials) -> None:
+def move_to_folder(file_id: str, folder_id: str, drive_service) -> None:
     """Move a file to a specific Google Drive folder."""
-    drive_service = build('drive', 'v3', credentials=creds)
+    # New presentations always start in My Drive's root, so move straight
+    # from there without first looking up the current parents
+    try:
+        drive_service.files().update(
+            fileId=file_id,
+            addParents=folder_id,
+            removeParents='root',
+            fields='id, parents'
+        ).execute(num_retries=API_RETRIES)
+        return
+    except HttpError as e:
+        if e.resp.status not in (400, 404):
+            raise
     
     # Get current parents
-    file = drive_service.files().get(fileId=file_id, fields='parents').execute()
+    file = drive_service.files().get(fileId=file_id, fields='parents').execute(num_retries=API_RETRIES)
     previous_parents = ",".join(file.get('parents', []))
     
     # Move to new folder
@@ -392,7 +524,7 @@ def move_to_folder(file_id: str, folder_id: str, creds: Credentials) -> None:
         addParents=folder_id,
         removeParents=previous_parents,
         fields='id, parents'
-    ).execute()
+    ).execute(num_retries=API_RETRIES)
 
 
 def get_default_title() -> str:
@@ -403,49 +535,74 @@ def get_default_title() -> str:
 
 def generate_slides(
     presentation_title: Optional[str],
-    slides_data: List[Tuple[str, str]],
+    slides_data: List[SlideSpec],
     credentials_path: str = 'credentials.json',
     token_path: str = 'token.json',
-    folder_id: str = DEFAULT_FOLDER_ID
+    folder_id: str = DEFAULT_FOLDER_ID,
+    template_id: Optional[str] = DEFAULT_TEMPLATE_ID
 ) -> str:
     """
     Main function to generate a Google Slides presentation.
     
     Args:
         presentation_title: Title for the presentation (None for auto-generated)
-        slides_data: List of (title, body) or (title, body, footer) tuples
+        slides_data: List of SlideSpec or (title, body[, footer]) tuples
         credentials_path: Path to OAuth credentials JSON
         token_path: Path to save/load token
         folder_id: Google Drive folder ID to save to
+        template_id: Drive ID of an empty presentation to copy (None to
+            create a new one, then delete its default slide)
     
     Returns:
         URL to the created presentation
     """
     creds = get_credentials(credentials_path, token_path)
     
+    # Clients are built per call and never shared between sessions: Slides
+    # is only used on this thread, Drive by one thread at a time
+    slides_service = build_service('slides', 'v1', creds)
+    drive_service = build_service('drive', 'v3', creds) if template_id or folder_id else None
+    
     # Use default title if not provided
     if not presentation_title:
         presentation_title = get_default_title()
     
     # Create presentation
-    presentation_id = create_presentation(presentation_title, creds)
-    
-    # Delete default slide
-    delete_default_slide(presentation_id, creds)
-    
-    # Add our slides
-    add_song_slides(presentation_id, slides_data, creds)
+    if template_id:
+        # The copy lands in the folder and has no default slide to delete
+        presentation_id = copy_template(template_id, presentation_title, folder_id, drive_service)
+        default_slide_ids, master_ids, layout_ids = [], [], []
+    else:
+        presentation_id, default_slide_ids, master_ids, layout_ids = create_presentation(
+            presentation_title, slides_service
+        )
     
-    # Move to folder
-    if folder_id:
-        try:
-            move_to_folder(presentation_id, folder_id, creds)
-            print(f"Moved presentation to folder: {folder_id}")
-        except Exception as e:
-            # Log error but don't fail - presentation was still created
-            print(f"Warning: Could not move to folder {folder_id}: {e}")
-            import traceback
-            traceback.print_exc()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Move to folder in the background; it only needs the presentation ID,
+        # so its Drive call overlaps with the Slides batchUpdate
+        move_future = None
+        if folder_id and not template_id:
+            move_future = executor.submit(move_to_folder, presentation_id, folder_id, drive_service)
+        
+        # Add our slides, deleting the default slide in the same round-trip
+        add_song_slides(
+            presentation_id,
+            slides_data,
+            slides_service,
+            delete_object_ids=default_slide_ids,
+            master_ids=master_ids,
+            layout_ids=layout_ids
+        )
+        
+        if move_future:
+            try:
+                move_future.result()
+                print(f"Moved presentation to folder: {folder_id}")
+            except Exception as e:
+                # Log error but don't fail - presentation was still created
+                print(f"Warning: Could not move to folder {folder_id}: {e}")
+                import traceback
+                traceback.print_exc()
     
     # Return the URL
     return f"https://docs.google.com/presentation/d/{presentation_id}/edit"
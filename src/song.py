@@ -0,0 +1,23 @@
+"""
+Song - Lightweight record for an uploaded song kept in session state.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+
+@dataclass
+class Song:
+    """
+    An uploaded song.
+    
+    Attributes:
+        sections: Dict of section_key -> lyrics
+        order: List of section keys in presentation order
+        title: Song title (from the filename)
+    """
+    __slots__ = ('sections', 'order', 'title')
+    
+    sections: Dict[str, str]
+    order: List[str]
+    title: str
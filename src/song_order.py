@@ -3,7 +3,49 @@ Song Order Parser - Parse song order format like "V1 V2 C V3 C Va"
 """
 
 import re
-from typing import List, Dict, Tuple
+from typing import List, Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+
+# First section marker in a line without a colon
+SECTION_MARKER_RE = re.compile(r'\s+(V\d*|C|B|Va|PC|Intro|Outro|Tag)[-\s]', re.IGNORECASE)
+
+DIGITS_RE = re.compile(r'\d+')
+
+# Spelled-out section names and their short keys
+SECTION_ALIASES = {
+    'V': 'V',
+    'VERSE': 'V',
+    'CHORUS': 'C',
+    'BRIDGE': 'B',
+    'VAMP': 'Va',
+}
+
+
+class ParsedSong(NamedTuple):
+    """A song from the order, with its name prepared for fuzzy matching."""
+    name: str
+    name_lower: str
+    words: FrozenSet[str]
+    order: List[str]
+
+
+def parse_order_sections(order_str: str) -> List[str]:
+    """
+    Split an order string like "V1 - Chorus Verse2" into section keys.
+    Returns e.g. ['V1', 'C', 'V2']
+    """
+    cleaned_sections = []
+    # Dashes and whitespace both separate sections
+    for s in order_str.replace('-', ' ').split():
+        s_upper = s.upper()
+        alias = SECTION_ALIASES.get(s_upper)
+        if alias:
+            s = alias
+        elif s_upper.startswith('VERSE'):
+            num = DIGITS_RE.search(s)
+            s = f"V{num.group() if num else ''}"
+        cleaned_sections.append(s)
+    return cleaned_sections
 
 
 def parse_song_order_line(line: str) -> Tuple[str, List[str]]:
@@ -24,69 +66,17 @@ def parse_song_order_line(line: str) -> Tuple[str, List[str]]:
         return None, []
     
     # Try colon first - explicit order format "Song Name: V1 C V2"
-    if ':' in line:
-        parts = line.split(':', 1)
-        song_name = parts[0].strip()
-        order_str = parts[1].strip()
-        
-        # If nothing after colon, just return song name with empty order
-        if not order_str:
-            return song_name, []
-        
-        # Parse the order string
-        order_str = order_str.strip(' -')
-        sections = re.split(r'[-\s]+', order_str)
-        
-        # Clean and normalize section names
-        cleaned_sections = []
-        for s in sections:
-            s = s.strip()
-            if s:
-                s_upper = s.upper()
-                if s_upper == 'VERSE' or s_upper == 'V':
-                    s = 'V'
-                elif s_upper == 'CHORUS':
-                    s = 'C'
-                elif s_upper == 'BRIDGE':
-                    s = 'B'
-                elif s_upper == 'VAMP':
-                    s = 'Va'
-                elif s_upper.startswith('VERSE'):
-                    num = re.search(r'\d+', s)
-                    s = f"V{num.group() if num else ''}"
-                cleaned_sections.append(s)
-        
-        return song_name, cleaned_sections
+    song_name, colon, order_str = line.partition(':')
+    if colon:
+        # Nothing (or only dashes) after the colon gives an empty order;
+        # parse_order_sections ignores surrounding whitespace itself
+        return song_name.strip(), parse_order_sections(order_str)
     
     # No colon - check if line has section markers
-    match = re.search(r'\s+(V\d*|C|B|Va|PC|Intro|Outro|Tag)[-\s]', line, re.IGNORECASE)
+    match = SECTION_MARKER_RE.search(line)
     if match:
         # Has section markers - parse them
-        song_name = line[:match.start()].strip()
-        order_str = line[match.start():].strip()
-        
-        order_str = order_str.strip(' -')
-        sections = re.split(r'[-\s]+', order_str)
-        
-        cleaned_sections = []
-        for s in sections:
-            s = s.strip()
-            if s:
-                s_upper = s.upper()
-                if s_upper == 'VERSE' or s_upper == 'V':
-                    s = 'V'
-                elif s_upper == 'CHORUS':
-                    s = 'C'
-                elif s_upper == 'BRIDGE':
-                    s = 'B'
-                elif s_upper == 'VAMP':
-                    s = 'Va'
-                elif s_upper.startswith('VERSE'):
-                    num = re.search(r'\d+', s)
-                    s = f"V{num.group() if num else ''}"
-                cleaned_sections.append(s)
-        
-        return song_name, cleaned_sections
+        return line[:match.start()].rstrip(), parse_order_sections(line[match.start():])
     
     # Just a song name - return with empty order (will use PDF order)
     return line, []
@@ -99,7 +89,11 @@ def parse_song_order_file(content: str) -> Dict[str, List[str]]:
     """
     result = {}
     
-    for line in content.strip().split('\n'):
+    for line in content.splitlines():
+        line = line.strip()
+        # Skip blanks and comments without a parse call
+        if not line or line[0] == '#':
+            continue
         song_name, order = parse_song_order_line(line)
         if song_name and order:
             result[song_name] = order
@@ -107,20 +101,39 @@ def parse_song_order_file(content: str) -> Dict[str, List[str]]:
     return result
 
 
-def match_song_to_order(song_name: str, order_dict: Dict[str, List[str]]) -> List[str]:
+def build_order_index(order_dict: Dict[str, List[str]]) -> List[ParsedSong]:
+    """
+    Lowercase every song name in order_dict once.
+    Pass the result to match_song_to_order when matching many songs.
+    """
+    index = []
+    for name, order in order_dict.items():
+        name_lower = name.lower().strip()
+        index.append(ParsedSong(name, name_lower, frozenset(name_lower.split()), order))
+    return index
+
+
+def match_song_to_order(
+    song_name: str,
+    order_dict: Dict[str, List[str]],
+    order_index: Optional[List[ParsedSong]] = None
+) -> List[str]:
     """
     Find matching order for a song name (fuzzy matching).
+    order_index is build_order_index(order_dict), built here if not given.
     """
     song_name_lower = song_name.lower().strip()
     
+    if order_index is None:
+        order_index = build_order_index(order_dict)
+    
     # Exact match first
-    for name, order in order_dict.items():
-        if name.lower().strip() == song_name_lower:
+    for _, name_lower, _, order in order_index:
+        if name_lower == song_name_lower:
             return order
     
     # Partial match (song name contains or is contained)
-    for name, order in order_dict.items():
-        name_lower = name.lower().strip()
+    for _, name_lower, _, order in order_index:
         if name_lower in song_name_lower or song_name_lower in name_lower:
             return order
     
@@ -129,8 +142,7 @@ def match_song_to_order(song_name: str, order_dict: Dict[str, List[str]]) -> Lis
     best_match = None
     best_score = 0
     
-    for name, order in order_dict.items():
-        name_words = set(name.lower().split())
+    for _, _, name_words, order in order_index:
         common = len(song_words & name_words)
         if common > best_score:
             best_score = common
@@ -147,16 +159,19 @@ def validate_order_against_sections(order: List[str], available_sections: Dict[s
     Check which sections in the order are missing from available sections.
     Returns list of missing section keys.
     """
+    # Every prefix of every key, and every key without its number, so each
+    # section is checked with set lookups instead of a scan over the keys
+    key_prefixes = {key[:i] for key in available_sections for i in range(len(key) + 1)}
+    key_bases = {key.rstrip('0123456789') for key in available_sections}
+    
     missing = []
     for section in order:
         # Handle sections without numbers that might need matching
         if section not in available_sections:
             # Try to find a match (e.g., 'V' might match 'V1')
-            found = False
-            for key in available_sections:
-                if key.startswith(section) or section.startswith(key.rstrip('0123456789')):
-                    found = True
-                    break
+            found = section in key_prefixes or any(
+                section[:i] in key_bases for i in range(len(section) + 1)
+            )
             if not found:
                 missing.append(section)
     return missing
@@ -180,7 +195,8 @@ def create_interleaved_order(sections: Dict[str, str]) -> List[str]:
     choruses = [k for k in sections if k == 'C']
     bridges = [k for k in sections if k.startswith('B')]
     vamps = [k for k in sections if k == 'Va']
-    others = [k for k in sections if k not in verses + choruses + bridges + vamps]
+    placed = set(verses) | set(choruses) | set(bridges) | set(vamps)
+    others = [k for k in sections if k not in placed]
     
     order = []
     
@@ -34,32 +34,44 @@ REVERENT_WORDS = {
     'thine': 'Thine',
 }
 
+# Reverent words as whole words, where apostrophes inside a word keep it
+# whole ("he's" is left alone) but quotes around it don't ("'he'").
+# Matched case-sensitively against lowercased text, which is much faster
+# than IGNORECASE.
+REVERENT_RE = re.compile(
+    r"(?<![\w'])'*("
+    + '|'.join(re.escape(w) for w in sorted(REVERENT_WORDS, key=len, reverse=True))
+    + r")(?='*(?![\w']))"
+)
+REVERENT_ANY_CASE_RE = re.compile(REVERENT_RE.pattern, re.IGNORECASE)
+
 
 def capitalize_reverent_words(text: str) -> str:
     """
     Capitalize words that refer to God in reverence.
     Context-aware to avoid false positives.
     """
-    # Process word by word while preserving structure
-    def replace_word(match):
-        word = match.group(0)
-        word_lower = word.lower()
-        
-        if word_lower in REVERENT_WORDS:
-            replacement = REVERENT_WORDS[word_lower]
-            # Preserve original case pattern if already capitalized differently
-            if word[0].isupper():
-                return replacement
-            # Only capitalize if it's in a context that likely refers to God
-            # (This is a simplified heuristic - lyrics context usually means it's reverent)
-            return replacement
-        
-        return word
-    
-    # Match words, including contractions
-    result = re.sub(r"\b[\w']+\b", replace_word, text)
-    
-    return result
+    # Lowercasing ASCII text keeps every index, so matches in the lowercased
+    # copy line up with the original; other text needs IGNORECASE
+    if text.isascii():
+        matches = REVERENT_RE.finditer(text.lower())
+    else:
+        matches = REVERENT_ANY_CASE_RE.finditer(text)
+    
+    pieces = []
+    last_end = 0
+    for match in matches:
+        start, end = match.span(1)
+        word = text[start:end]
+        pieces.append(text[last_end:start])
+        # .get: IGNORECASE also matches e.g. "ſon", whose lower() isn't "son"
+        pieces.append(REVERENT_WORDS.get(word.lower(), word))
+        last_end = end
+    
+    if not pieces:
+        return text
+    pieces.append(text[last_end:])
+    return ''.join(pieces)
 
 
 def split_into_slides(text: str, max_lines: int = 4) -> List[str]:
@@ -68,31 +80,22 @@ def split_into_slides(text: str, max_lines: int = 4) -> List[str]:
     Each chunk has at most max_lines lines.
     Tries to break at natural points (empty lines, punctuation).
     """
-    lines = [line.strip() for line in text.strip().split('\n')]
-    
-    # Remove empty lines but remember where they were (natural break points)
-    line_data = []  # (line_text, is_after_empty)
-    prev_empty = False
-    for line in lines:
-        if not line:
-            prev_empty = True
-        else:
-            line_data.append((line, prev_empty))
-            prev_empty = False
-    
-    if not line_data:
-        return []
-    
     slides = []
     current_slide_lines = []
+    prev_empty = False  # Empty lines are natural break points
     
-    for i, (line, is_after_empty) in enumerate(line_data):
+    for line in text.strip().split('\n'):
+        line = line.strip()
+        if not line:
+            prev_empty = True
+            continue
+        
         # Check if we should start a new slide
         should_break = False
         
         if len(current_slide_lines) >= max_lines:
             should_break = True
-        elif len(current_slide_lines) > 0 and is_after_empty and len(current_slide_lines) >= max_lines // 2:
+        elif len(current_slide_lines) > 0 and prev_empty and len(current_slide_lines) >= max_lines // 2:
             # Break at empty line if we have a reasonable amount of content
             should_break = True
         
@@ -101,6 +104,7 @@ def split_into_slides(text: str, max_lines: int = 4) -> List[str]:
             current_slide_lines = []
         
         current_slide_lines.append(line)
+        prev_empty = False
     
     # Don't forget the last slide
     if current_slide_lines:
@@ -143,6 +147,13 @@ def format_section_for_slides(
     return slides
 
 
+def _section_base(key_upper: str) -> str:
+    """Base type of an uppercased section key: 'V2' -> 'V', 'C1A' -> 'C', 'VA' -> 'VA'."""
+    if key_upper.startswith('VA'):
+        return 'VA'
+    return key_upper.rstrip('0123456789AB')
+
+
 def format_song_for_slides(
     sections: dict,
     order: List[str],
@@ -163,6 +174,14 @@ def format_song_for_slides(
     """
     all_slides = []
     
+    # Slides already made for each section key
+    formatted = {}
+    
+    # Section keys grouped by base type, in PDF order
+    keys_by_base = {}
+    for key in sections:
+        keys_by_base.setdefault(_section_base(key.upper()), []).append(key)
+    
     for section_key in order:
         # Find the section (handle variations like 'V' matching 'V1', 'C' matching 'C1A')
         section_text = None
@@ -171,31 +190,15 @@ def format_song_for_slides(
         # Normalize the search key
         search_key = section_key.upper().strip()
         
-        # Get the base type for matching (C, V, Va, B, etc.)
-        if search_key.startswith('VA'):
-            search_base = 'VA'
-        else:
-            search_base = search_key.rstrip('0123456789AB')
-        
         # Exact match first
         if search_key in sections:
             section_text = sections[search_key]
             matched_key = search_key
         else:
-            # Find first matching section by type
+            # Find first matching section by type (C, V, Va, B, etc.)
             # If order says "C" and we have "C1", use "C1"
             # If order says "C" multiple times and we only have one chorus, reuse it
-            candidates = []
-            for key in sections:
-                key_upper = key.upper()
-                if key_upper.startswith('VA'):
-                    key_base = 'VA'
-                else:
-                    key_base = key_upper.rstrip('0123456789AB')
-                
-                # Match if same base type
-                if search_base == key_base:
-                    candidates.append(key)
+            candidates = keys_by_base.get(_section_base(search_key), [])
             
             # Pick the first/best match
             if candidates:
@@ -211,13 +214,17 @@ def format_song_for_slides(
                     section_text = sections[matched_key]
         
         if section_text:
-            display_name = get_display_name_func(matched_key)
-            slides = format_section_for_slides(
-                matched_key, 
-                section_text, 
-                display_name, 
-                max_lines
-            )
+            # Repeated sections (e.g. the chorus) are formatted only once
+            slides = formatted.get(matched_key)
+            if slides is None:
+                display_name = get_display_name_func(matched_key)
+                slides = format_section_for_slides(
+                    matched_key, 
+                    section_text, 
+                    display_name, 
+                    max_lines
+                )
+                formatted[matched_key] = slides
             all_slides.extend(slides)
         else:
             # Section not found - add placeholder